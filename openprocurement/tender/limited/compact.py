@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+""" Compact in-memory form of stored tender lists.
+
+Lists kept unhydrated by lazy hydration are plain stored data: a dict
+per award, contract, complaint or document and nested dicts for their
+values, periods and organizations, each dict taking from a few hundred
+bytes to a kilobyte on 64-bit CPython 2. With ``limited.compact_lists``
+enabled they are kept as CompactList instead: dicts are slotted
+key/value tuple pairs with keys tuples shared by all dicts of the same
+shape, lists are tuples and equal strings of a tender are stored once.
+Items are expanded back to plain stored data when read.
+"""
+
+
+class CompactDict(object):
+    """ Stored dict as shared keys tuple and values tuple """
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+
+class CompactList(object):
+    """ Read-only list of stored data, items are expanded when read """
+    __slots__ = ('items',)
+
+    def __init__(self, items, memo=None):
+        memo = {} if memo is None else memo
+        self.items = tuple([compact(i, memo) for i in items])
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return (expand(i) for i in self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [expand(i) for i in self.items[index]]
+        return expand(self.items[index])
+
+
+def compact(value, memo):
+    """ Compact form of stored ``value``, ``memo`` keeps single copies of
+        keys tuples and strings shared between values.
+    """
+    if isinstance(value, dict):
+        keys = tuple(sorted(value))
+        keys = memo.setdefault(keys, keys)
+        return CompactDict(keys, tuple([compact(value[i], memo) for i in keys]))
+    if isinstance(value, list):
+        return tuple([compact(i, memo) for i in value])
+    if isinstance(value, basestring):
+        return memo.setdefault(value, value)
+    return value
+
+
+def expand(value):
+    """ Stored data of compacted ``value`` """
+    if isinstance(value, CompactDict):
+        return dict(zip(value.keys, [expand(i) for i in value.values]))
+    if isinstance(value, tuple):
+        return [expand(i) for i in value]
+    return value
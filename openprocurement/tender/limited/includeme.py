@@ -1,38 +1,62 @@
 # -*- coding: utf-8 -*-
 from pyramid.interfaces import IRequest
+from pyramid.settings import asbool
+from openprocurement.api import utils as api_utils
 from openprocurement.api.interfaces import IContentConfigurator
 from openprocurement.tender.limited.models import (
     ReportingTender, NegotiationTender, NegotiationQuickTender,
-    IReportingTender, INegotiationTender, INegotiationQuickTender
+    IReportingTender, INegotiationTender, INegotiationQuickTender,
+    LazyListsModel
 )
 from openprocurement.tender.limited.adapters import (
     TenderReportingConfigurator, TenderNegotiationConfigurator,
     TenderNegotiationQuickConfigurator
 )
+from openprocurement.tender.limited.locks import TenderLocks, LOCK_FILES, LOCK_TIMEOUT
+from openprocurement.tender.limited.timing import timings
+from openprocurement.tender.limited.utils import DocumentServiceSession
 
 
-def includeme(config):
-    config.add_tender_procurementMethodType(ReportingTender)
-    config.scan("openprocurement.tender.limited.views")
-    config.scan("openprocurement.tender.limited.subscribers")
-    config.registry.registerAdapter(TenderReportingConfigurator,
-                                    (IReportingTender, IRequest),
+def includeme_limited(config, tender_model, tender_interface, configurator):
+    """ Register limited procedure type.
+
+    Views and subscribers of all limited procedures live in the same
+    modules and are bound to procedure type by predicates, so they are
+    scanned only by the first enabled limited plugin.
+    """
+    config.add_tender_procurementMethodType(tender_model)
+    settings = config.get_settings()
+    if asbool(settings.get('limited.timing', False)):
+        timings.enabled = True
+    if asbool(settings.get('limited.lazy_hydration', False)):
+        LazyListsModel.lazy_hydration = True
+    if asbool(settings.get('limited.compact_lists', False)):
+        LazyListsModel.compact_lists = True
+    if asbool(settings.get('limited.contract_item_references', False)):
+        ReportingTender.contract_item_references = True
+    if not getattr(config.registry, 'limited_views_scanned', False):
+        config.scan("openprocurement.tender.limited.views")
+        config.scan("openprocurement.tender.limited.subscribers")
+        api_utils.SESSION = DocumentServiceSession()  # streams document uploads of limited tenders
+        if asbool(settings.get('limited.write_queue', False)):
+            config.registry.limited_tender_locks = TenderLocks(
+                settings.get('limited.write_queue.lock_dir'),
+                int(settings.get('limited.write_queue.lock_files', LOCK_FILES)),
+                float(settings.get('limited.write_queue.timeout', LOCK_TIMEOUT)))
+            config.add_tween("openprocurement.tender.limited.locks.tender_locks_tween_factory")
+        config.registry.limited_views_scanned = True
+    config.registry.registerAdapter(configurator,
+                                    (tender_interface, IRequest),
                                     IContentConfigurator)
 
 
+def includeme(config):
+    includeme_limited(config, ReportingTender, IReportingTender, TenderReportingConfigurator)
+
+
 def includeme_negotiation(config):
-    config.add_tender_procurementMethodType(NegotiationTender)
-    config.scan("openprocurement.tender.limited.views")
-    config.scan("openprocurement.tender.limited.subscribers")
-    config.registry.registerAdapter(TenderNegotiationConfigurator,
-                                    (INegotiationTender, IRequest),
-                                    IContentConfigurator)
+    includeme_limited(config, NegotiationTender, INegotiationTender, TenderNegotiationConfigurator)
 
 
 def includeme_negotiation_quick(config):
-    config.add_tender_procurementMethodType(NegotiationQuickTender)
-    config.scan("openprocurement.tender.limited.views")
-    config.scan("openprocurement.tender.limited.subscribers")
-    config.registry.registerAdapter(TenderNegotiationQuickConfigurator,
-                                    (INegotiationQuickTender, IRequest),
-                                    IContentConfigurator)
+    includeme_limited(config, NegotiationQuickTender, INegotiationQuickTender, TenderNegotiationQuickConfigurator)
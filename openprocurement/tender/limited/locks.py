@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+""" Per-tender serialization of writes.
+
+With ``limited.write_queue = true`` in application settings mutating
+requests to the same limited tender (reporting, negotiation and
+negotiation.quick) are handled one at a time by a worker, so they don't
+race on the tender revision, while requests to different tenders stay
+parallel. ``limited.write_queue.lock_dir`` additionally serializes them
+across workers of one host with lock files.
+
+The tween runs before traversal and has only the tender id from the
+request path; procedure type of tenders is read from the database once
+and kept in a bounded cache, as it never changes. Requests waiting for
+a lock longer than ``limited.write_queue.timeout`` seconds (30 by
+default) get 409 Conflict, so a stuck writer doesn't hang them.
+
+Lock files are a fixed set of ``limited.write_queue.lock_files`` files
+(64 by default) shared by tenders with the same hash of id, so the lock
+directory doesn't grow with the number of tenders. Each lock opens its
+own file descriptor and flock locks of separate descriptors exclude each
+other also within a process, so tenders sharing a lock file are
+serialized both across and within workers.
+"""
+import errno
+import os
+import re
+from collections import OrderedDict
+from hashlib import md5
+from contextlib import contextmanager
+from threading import Lock
+from time import sleep, time
+
+from pyramid.response import Response
+
+TENDER_PATH = re.compile(r'/tenders/([0-9a-f]{32})(?:/|$)')
+MUTATING_METHODS = frozenset(['POST', 'PUT', 'PATCH', 'DELETE'])
+LIMITED_TYPES = frozenset(['reporting', 'negotiation', 'negotiation.quick'])
+LOCK_POLL_INTERVAL = 0.01  # seconds; non-blocking polling keeps gevent workers responsive
+LOCK_FILES = 64
+LOCK_TIMEOUT = 30  # seconds
+TENDER_TYPES_CACHE_SIZE = 10000
+
+
+class LockTimeout(Exception):
+    """ Lock wasn't acquired in time """
+
+
+def wait_for(acquire, deadline):
+    while not acquire():
+        if deadline is not None and time() >= deadline:
+            raise LockTimeout()
+        sleep(LOCK_POLL_INTERVAL)
+
+
+@contextmanager
+def file_lock(path, deadline=None):
+    import fcntl
+
+    def acquire():
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except IOError as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return False
+        return True
+
+    with open(path, 'a') as lock_file:
+        wait_for(acquire, deadline)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class TenderLocks(object):
+    """ Lock per tender, kept only while requests to the tender are in progress """
+
+    def __init__(self, lock_dir=None, lock_files=LOCK_FILES, timeout=LOCK_TIMEOUT):
+        self.lock_dir = lock_dir
+        self.lock_files = lock_files
+        self.timeout = timeout
+        self.lock = Lock()
+        self.locks = {}
+
+    def lock_path(self, tender_id):
+        index = int(md5(tender_id).hexdigest(), 16) % self.lock_files
+        return os.path.join(self.lock_dir, '{}.lock'.format(index))
+
+    @contextmanager
+    def __call__(self, tender_id):
+        deadline = time() + self.timeout if self.timeout else None
+        with self.lock:
+            entry = self.locks.setdefault(tender_id, [Lock(), 0])
+            entry[1] += 1
+        try:
+            wait_for(lambda: entry[0].acquire(False), deadline)
+            try:
+                if self.lock_dir:
+                    with file_lock(self.lock_path(tender_id), deadline):
+                        yield
+                else:
+                    yield
+            finally:
+                entry[0].release()
+        finally:
+            with self.lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self.locks[tender_id]
+
+
+class TenderTypes(object):
+    """ Bounded cache of tenders procurementMethodType """
+
+    def __init__(self, maxsize=TENDER_TYPES_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.types = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, db, tender_id):
+        with self.lock:
+            if tender_id in self.types:
+                return self.types[tender_id]
+        doc = db.get(tender_id)
+        if doc is None:
+            return
+        with self.lock:
+            self.types[tender_id] = doc.get('procurementMethodType')
+            while len(self.types) > self.maxsize:
+                self.types.popitem(last=False)
+        return doc.get('procurementMethodType')
+
+
+def lock_timeout_response():
+    return Response(json_body={
+        'status': 'error',
+        'errors': [{'location': 'url', 'name': 'tender_id',
+                    'description': 'Tender is locked by another request, try again later'}]
+    }, status=409)
+
+
+def tender_locks_tween_factory(handler, registry):
+    """ Serialize mutating requests to limited tenders, registered with ``limited.write_queue`` """
+    locks = registry.limited_tender_locks
+    tender_types = TenderTypes()
+
+    def tender_locks_tween(request):
+        if request.method not in MUTATING_METHODS:
+            return handler(request)
+        match = TENDER_PATH.search(request.path_info)
+        if match is None or tender_types.get(request.registry.db, match.group(1)) not in LIMITED_TYPES:
+            return handler(request)
+        try:
+            with locks(match.group(1)):
+                return handler(request)
+        except LockTimeout:
+            return lock_timeout_response()
+    return tender_locks_tween
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
+from collections import Counter
+from contextlib import contextmanager
+from threading import local
 from zope.interface import implementer
 from pyramid.security import Allow
+from schematics.models import FieldDescriptor
 from schematics.transforms import whitelist, blacklist
-from schematics.types import StringType, MD5Type, BooleanType
-from schematics.types.compound import ModelType
+from schematics.types import StringType, MD5Type, BooleanType, IntType
+from schematics.types.compound import ModelType, DictType
 from schematics.types.serializable import serializable
 from schematics.exceptions import ValidationError
 from openprocurement.api.utils import get_now
@@ -33,6 +37,9 @@ from openprocurement.tender.core.models import (
 from openprocurement.tender.openua.models import Complaint as BaseComplaint
 from openprocurement.tender.openua.models import Item
 from openprocurement.tender.openua.models import Tender as OpenUATender
+from openprocurement.tender.limited.compact import CompactList
+from openprocurement.tender.limited.serializers import raw_serializable
+from openprocurement.tender.limited.utils import compact_contract_items, expand_contract_items
 
 
 class IReportingTender(ITender):
@@ -47,37 +54,207 @@ class INegotiationQuickTender(INegotiationTender):
     """ Negotiation Quick Tender marker interface """
 
 
+serialization_scope = local()
+
+
+@contextmanager
+def serialize_in_scope():
+    """ Memoise inherited values (see ``Value.get_inherited_value``) until
+        the outermost serialization of a model tree is done.
+    """
+    if getattr(serialization_scope, 'owners', None) is not None:
+        yield
+        return
+    serialization_scope.owners = {}
+    try:
+        yield
+    finally:
+        serialization_scope.owners = None
+
+
+class LazyListDescriptor(FieldDescriptor):
+    """ Field descriptor hydrating raw list data on first access """
+
+    def __get__(self, instance, cls):
+        if instance is not None and self.name in instance.__dict__.get('_lazy_data', ()):
+            instance.hydrate(self.name)
+        return super(LazyListDescriptor, self).__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        instance.__dict__.get('_lazy_data', {}).pop(self.name, None)
+        super(LazyListDescriptor, self).__set__(instance, value)
+
+
+class LazyListsModel(object):
+    """ Model mixin keeping raw data of ``lazy_fields`` lists until they
+        are accessed, so e.g. a single award read doesn't build models of
+        all lots, contracts and documents of the tender.
+
+        Hydration is off unless ``limited.lazy_hydration`` is enabled in
+        settings. Operations on the whole model hydrate all lists first.
+        With ``limited.compact_lists`` raw data is kept as CompactList.
+    """
+    lazy_fields = ()
+    lazy_hydration = False
+    compact_lists = False
+
+    def __init__(self, raw_data=None, *args, **kwargs):
+        lazy_data = {}
+        if LazyListsModel.lazy_hydration and isinstance(raw_data, dict):
+            lazy_data = dict([(i, raw_data[i]) for i in self.lazy_fields if raw_data.get(i)])
+            if lazy_data:
+                raw_data = dict([(i, j) for i, j in raw_data.items() if i not in lazy_data])
+            if lazy_data and LazyListsModel.compact_lists:
+                memo = {}
+                lazy_data = dict([(i, CompactList(j, memo)) for i, j in lazy_data.items()])
+        super(LazyListsModel, self).__init__(raw_data, *args, **kwargs)
+        if lazy_data:
+            self._lazy_data = lazy_data
+
+    def hydrate(self, name=None):
+        lazy_data = self.__dict__.get('_lazy_data')
+        if not lazy_data:
+            return
+        for field_name in [name] if name else list(lazy_data):
+            raw_value = lazy_data.pop(field_name, None)
+            if raw_value is None:
+                continue
+            value = self._fields[field_name].to_native(list(raw_value))
+            for item in value:
+                item.__parent__ = self
+            self._data[field_name] = value
+
+    def raw_list(self, name):
+        """ Raw data of the list if it isn't hydrated yet, otherwise None """
+        return self.__dict__.get('_lazy_data', {}).get(name)
+
+    def __iter__(self):
+        self.hydrate()
+        return super(LazyListsModel, self).__iter__()
+
+    def __eq__(self, other):
+        self.hydrate()
+        if isinstance(other, LazyListsModel):
+            other.hydrate()
+        return super(LazyListsModel, self).__eq__(other)
+
+    def keys(self):
+        self.hydrate()
+        return super(LazyListsModel, self).keys()
+
+    def items(self):
+        self.hydrate()
+        return super(LazyListsModel, self).items()
+
+    def values(self):
+        self.hydrate()
+        return super(LazyListsModel, self).values()
+
+    def validate(self, *args, **kwargs):
+        self.hydrate()
+        return super(LazyListsModel, self).validate(*args, **kwargs)
+
+    def import_data(self, *args, **kwargs):
+        self.hydrate()
+        return super(LazyListsModel, self).import_data(*args, **kwargs)
+
+    def serialize(self, *args, **kwargs):
+        self.hydrate()
+        with serialize_in_scope():
+            return super(LazyListsModel, self).serialize(*args, **kwargs)
+
+    def to_native(self, *args, **kwargs):
+        self.hydrate()
+        return super(LazyListsModel, self).to_native(*args, **kwargs)
+
+    def to_primitive(self, *args, **kwargs):
+        self.hydrate()
+        with serialize_in_scope():
+            return super(LazyListsModel, self).to_primitive(*args, **kwargs)
+
+
+def lazy_lists(*names):
+    """ Class decorator hydrating ``names`` lists of model lazily """
+    def decorator(cls):
+        cls.lazy_fields = names
+        for name in names:
+            setattr(cls, name, LazyListDescriptor(name))
+        return cls
+    return decorator
+
+
 class Value(BaseValue):
     currency = StringType(max_length=3, min_length=3)
     valueAddedTaxIncluded = BooleanType()
 
+    def get_inherited_value(self):
+        """ Value of the closest contract (or of the tender) this value is nested in.
+
+        Within a serialization scope the value found is memoised for the
+        models passed on the way, so the walk to the owner is done once per
+        nested model for all computed fields of the serialized tree.
+        """
+        owner = self.__parent__
+        if not isinstance(owner, Model):
+            return {}
+        owners = getattr(serialization_scope, 'owners', None)
+        if owners is None:
+            owners = {}
+        path = []
+        value = None
+        while id(owner) not in owners:
+            path.append(owner)
+            if not isinstance(owner.__parent__, Model):
+                value = owner.get("value", {})
+                break
+            owner = owner.__parent__
+            if isinstance(owner, BaseContract):
+                value = owner.get("value", {})
+                break
+        else:
+            value = owners[id(owner)]
+        for model in path:
+            owners[id(model)] = value
+        return value
+
     @serializable(serialized_name="currency", serialize_when_none=False)
     def unit_currency(self):
         if self.currency is not None:
             return self.currency
-
-        context = self.__parent__ if isinstance(self.__parent__, Model) else {}
-        while isinstance(context.__parent__, Model):
-            context = context.__parent__
-            if isinstance(context, BaseContract):
-                break
-
-        value = context.get("value", {})
-        return value.get("currency", None)
+        return self.get_inherited_value().get("currency", None)
 
     @serializable(serialized_name="valueAddedTaxIncluded", serialize_when_none=False)
     def unit_valueAddedTaxIncluded(self):
         if self.valueAddedTaxIncluded is not None:
             return self.valueAddedTaxIncluded
+        return self.get_inherited_value().get("valueAddedTaxIncluded", None)
+
+
+def get_raw_inherited_value(parents):
+    """ Value.get_inherited_value for raw data nested in ``parents`` """
+    if not parents:
+        return {}
+    index = len(parents) - 1
+    while index > 0:
+        index -= 1
+        if issubclass(parents[index][0], BaseContract):
+            break
+    value = parents[index][1].get("value")
+    return value if value is not None else {}
+
+
+@raw_serializable(Value, 'unit_currency')
+def raw_value_currency(data, parents):
+    if data.get("currency") is not None:
+        return data["currency"]
+    return get_raw_inherited_value(parents).get("currency", None)
 
-        context = self.__parent__ if isinstance(self.__parent__, Model) else {}
-        while isinstance(context.__parent__, Model):
-            context = context.__parent__
-            if isinstance(context, BaseContract):
-                break
 
-        value = context.get("value", {})
-        return value.get("valueAddedTaxIncluded", None)
+@raw_serializable(Value, 'unit_valueAddedTaxIncluded')
+def raw_value_tax_included(data, parents):
+    if data.get("valueAddedTaxIncluded") is not None:
+        return data["valueAddedTaxIncluded"]
+    return get_raw_inherited_value(parents).get("valueAddedTaxIncluded", None)
 
 
 class Unit(BaseUnit):
@@ -107,7 +284,8 @@ class Complaint(BaseComplaint):
         }
 
 
-class Contract(BaseContract):
+@lazy_lists('documents')
+class Contract(LazyListsModel, BaseContract):
     items = ListType(ModelType(Item))
 
     class Options:
@@ -135,13 +313,15 @@ Unit = BaseUnit
 Value = BaseValue
 
 
+sequences_role = blacklist('sequences')
 award_edit_role = blacklist('id', 'items', 'date', 'documents', 'complaints', 'complaintPeriod')
 award_create_role = blacklist('id', 'status', 'items', 'date', 'documents', 'complaints', 'complaintPeriod')
 award_create_reporting_role = award_create_role + blacklist('qualified')
 award_edit_reporting_role = award_edit_role + blacklist('qualified')
 
 
-class Award(BaseAward):
+@lazy_lists('documents', 'complaints')
+class Award(LazyListsModel, BaseAward):
     """ An award for the given procurement. There may be more than one award
         per contracting process e.g. because the contract is split amongst
         different providers, or because it is a standing offer.
@@ -194,31 +374,32 @@ class ProcuringEntity(BaseProcuringEntity):
         }
 
 
+@lazy_lists('documents', 'awards', 'contracts', 'cancellations')
 @implementer(ITender)
-class Tender(BaseTender):
+class Tender(LazyListsModel, BaseTender):
     """Data regarding tender process - publicly inviting prospective contractors
        to submit bids for evaluation and selecting a winner or winners.
     """
 
     class Options:
         roles = {
-            'plain': plain_role,
-            'create': create_role,
-            'edit': edit_role,
+            'plain': plain_role + sequences_role,
+            'create': create_role + sequences_role,
+            'edit': edit_role + sequences_role,
             'edit_draft': draft_role,
-            'edit_active': edit_role,
+            'edit_active': edit_role + sequences_role,
             'edit_active.awarded': whitelist(),
             'edit_complete': whitelist(),
             'edit_unsuccessful': whitelist(),
             'edit_cancelled': whitelist(),
-            'view': view_role,
+            'view': view_role + sequences_role,
             'listing': listing_role,
-            'draft': enquiries_role,
-            'active': enquiries_role,
-            'active.awarded': view_role,
-            'complete': view_role,
-            'unsuccessful': view_role,
-            'cancelled': view_role,
+            'draft': enquiries_role + sequences_role,
+            'active': enquiries_role + sequences_role,
+            'active.awarded': view_role + sequences_role,
+            'complete': view_role + sequences_role,
+            'unsuccessful': view_role + sequences_role,
+            'cancelled': view_role + sequences_role,
             'Administrator': Administrator_role,
             'chronograph': chronograph_role,  # remove after chronograph fix
             'chronograph_view': chronograph_view_role, # remove after chronograph fix
@@ -236,6 +417,7 @@ class Tender(BaseTender):
     status = StringType(choices=['draft', 'active', 'complete', 'cancelled', 'unsuccessful'], default='active')
     mode = StringType(choices=['test'])
     cancellations = ListType(ModelType(Cancellation), default=list())
+    sequences = DictType(IntType())  # last allocated numbers of tender object IDs, not shown in API
 
     create_accreditation = '13'
     edit_accreditation = 2
@@ -243,6 +425,41 @@ class Tender(BaseTender):
     block_complaint_status = OpenUATender.block_complaint_status
 
     __parent__ = None
+    contract_item_references = False  # store contract items as references, ``limited.contract_item_references``
+
+    def __init__(self, raw_data=None, *args, **kwargs):
+        super(ReportingTender, self).__init__(expand_contract_items(raw_data), *args, **kwargs)
+
+    def store(self, *args, **kwargs):
+        self._storing = self.contract_item_references
+        try:
+            return super(ReportingTender, self).store(*args, **kwargs)
+        finally:
+            del self._storing
+
+    def to_primitive(self, role=None, *args, **kwargs):
+        data = super(ReportingTender, self).to_primitive(role, *args, **kwargs)
+        if role is None and self.__dict__.get('_storing'):
+            compact_contract_items(data)
+        return data
+
+    def allocate_number(self, sequence, initial=None):
+        """ Allocate next number of the tender sequence.
+
+            ``initial`` is called to count numbers already in use by tenders
+            stored before the sequence was introduced. The number is saved
+            with the tender revision, so callers allocate it inside the
+            update re-applied by ``save_rebased`` and a concurrent writer
+            gets the next number instead of a conflict.
+        """
+        if self.sequences is None:
+            self.sequences = {}
+        number = self.sequences.get(sequence)
+        if number is None:
+            number = initial() if initial else 0
+        number += 1
+        self.sequences[sequence] = number
+        return number
 
     def get_role(self):
         root = self.__parent__
@@ -269,6 +486,7 @@ ReportingTender = Tender
 Item = BaseItem
 
 
+@lazy_lists('documents', 'complaints')
 class Award(ReportingAward):
 
     lotID = MD5Type()
@@ -311,8 +529,19 @@ class Lot(BaseLot):
                           valueAddedTaxIncluded=self.__parent__.value.valueAddedTaxIncluded))
 
 
+@raw_serializable(Lot, 'lot_value')
+def raw_lot_value(data, parents):
+    tender_value = parents[-1][1].get("value")
+    value = {
+        "amount": float(data["value"]["amount"]),
+        "currency": tender_value.get("currency"),
+        "valueAddedTaxIncluded": tender_value.get("valueAddedTaxIncluded"),
+    }
+    return dict([(i, j) for i, j in value.items() if j is not None])
 
-class Contract(BaseContract):
+
+@lazy_lists('documents')
+class Contract(LazyListsModel, BaseContract):
     items = ListType(ModelType(Item))
 
     class Options:
@@ -332,6 +561,42 @@ class Contract(BaseContract):
         return role
 
 
+class LotIndex(object):
+    """ Awards, cancellations and contracts of a tender grouped by lot """
+
+    def __init__(self, tender):
+        self.key = (len(tender.lots), len(tender.awards), len(tender.cancellations), len(tender.contracts))
+        self.lots = dict([(lot.id, lot) for lot in tender.lots])
+        self.lot_statuses = Counter([lot.status for lot in tender.lots])
+        self.awards = {}
+        self.awards_by_id = {}
+        self.cancellations = {}
+        self.contracts = {}
+        for award in tender.awards:
+            self.awards.setdefault(award.lotID, []).append(award)
+            self.awards_by_id[award.id] = award
+        for cancellation in tender.cancellations:
+            self.cancellations.setdefault(cancellation.relatedLot, []).append(cancellation)
+        for contract in tender.contracts:
+            award = self.awards_by_id.get(contract.awardID)
+            self.contracts.setdefault(award.lotID if award else None, []).append(contract)
+
+    def set_lot_status(self, lot, status):
+        """ Change lot status keeping lot status counters up to date """
+        self.lot_statuses[lot.status] -= 1
+        self.lot_statuses[status] += 1
+        lot.status = status
+
+    def complaints(self, lotID, statuses=None):
+        return [
+            i
+            for a in self.awards.get(lotID, [])
+            for i in a.complaints
+            if statuses is None or i.status in statuses
+        ]
+
+
+@lazy_lists('documents', 'lots', 'awards', 'contracts', 'cancellations')
 @implementer(INegotiationTender)
 class Tender(ReportingTender):
     """ Negotiation """
@@ -350,9 +615,27 @@ class Tender(ReportingTender):
     procuring_entity_kinds = ['general', 'special', 'defense']
     lots = ListType(ModelType(Lot), default=list(), validators=[validate_lots_uniq])
 
+    _lot_index = None
+
+    def get_lot_index(self):
+        """ Lot index built on first use and rebuilt after awards,
+            cancellations or contracts are added to the tender.
+        """
+        key = (len(self.lots), len(self.awards), len(self.cancellations), len(self.contracts))
+        if self._lot_index is None or self._lot_index.key != key:
+            self._lot_index = LotIndex(self)
+        return self._lot_index
+
+    def invalidate_lot_index(self):
+        """ Drop the lot index, e.g. after award lotID or lot status was
+            changed outside of ``LotIndex.set_lot_status``
+        """
+        self._lot_index = None
+
 NegotiationTender = Tender
 
 
+@lazy_lists('documents', 'lots', 'awards', 'contracts', 'cancellations')
 @implementer(INegotiationQuickTender)
 class Tender(NegotiationTender):
     """ Negotiation """
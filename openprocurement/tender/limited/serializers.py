@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+""" Serialization of stored (raw) tender data without building models.
+
+A serializer is compiled once per model class and role from the model
+schema: role filters are resolved at compile time, fields stored in
+their primitive form (strings, booleans) are copied, other fields are
+converted by their type, nested models use their own serializers.
+Computed fields need a raw implementation registered by
+``raw_serializable``; models with other computed fields or with roles
+that aren't plain white/black lists aren't compiled, and callers fall
+back to model serialization. That is the case for models with documents
+(awards, contracts, cancellations): document ``url`` is computed from
+the request and the document service settings, so only lots are
+serialized from stored data.
+"""
+from threading import RLock
+
+from schematics.transforms import Role
+from schematics.types import StringType, BooleanType
+from schematics.types.compound import ModelType, ListType
+
+raw_serializables = {}
+serializers = {}
+serializers_lock = RLock()
+
+
+def raw_serializable(model_class, name):
+    """ Register raw implementation ``func(data, parents)`` of model computed field.
+
+        ``parents`` are (model class, data or model) pairs of the objects
+        the data is nested in, the closest one last.
+    """
+    def decorator(func):
+        raw_serializables[(model_class, name)] = func
+        return func
+    return decorator
+
+
+def get_role_filter(model_class, role):
+    roles = model_class._options.roles
+    return roles[role] if role in roles else roles.get('default')
+
+
+def get_raw_serializable(model_class, name):
+    for cls in model_class.__mro__:
+        if name in cls.__dict__:
+            return raw_serializables.get((cls, name))
+
+
+def compile_value(field, role):
+    """ Function converting stored value of the field, None if it can't be compiled """
+    if isinstance(field, ModelType):
+        serialize = get_serializer(field.model_class, role)
+        if serialize is None:
+            return
+        return lambda value, parents: serialize(value, parents)
+    if isinstance(field, ListType) and isinstance(field.field, ModelType):
+        serialize = get_serializer(field.field.model_class, role)
+        if serialize is None:
+            return
+
+        def serialize_list(value, parents):
+            data = [serialize(i, parents) for i in value]
+            return [i for i in data if i is not None] or None
+        return serialize_list
+    if isinstance(field, (StringType, BooleanType)):
+        return lambda value, parents: value
+    return lambda value, parents: field.to_primitive(field.to_native(value)) if value not in ([], {}) else None
+
+
+def compile_serializer(model_class, role):
+    role_filter = get_role_filter(model_class, role)
+    if role_filter is not None and not isinstance(role_filter, Role):
+        return
+    exported = lambda name: role_filter is None or not role_filter(name, None)
+    serialize_when_none = model_class._options.serialize_when_none
+    fields = []
+    for name, field in model_class._fields.items():
+        if not exported(name):
+            continue
+        convert = compile_value(field, role)
+        if convert is None:
+            return
+        print_none = field.serialize_when_none if field.serialize_when_none is not None else serialize_when_none
+        fields.append((field.serialized_name or name, convert, field.default, print_none))
+    computed = []
+    for name, serializable in model_class._serializables.items():
+        if not exported(name):
+            continue
+        func = get_raw_serializable(model_class, name)
+        if func is None:
+            return
+        serialized_name = getattr(serializable, 'serialized_name', None) or \
+            getattr(serializable.type, 'serialized_name', None) or name
+        computed.append((serialized_name, func, getattr(serializable, 'serialize_when_none', True)))
+
+    def serialize(data, parents=()):
+        result = {}
+        nested_parents = parents + ((model_class, data),)
+        for name, convert, default, print_none in fields:
+            value = data.get(name)
+            if value is None and default is not None:
+                value = default() if callable(default) else default
+            if value is not None:
+                value = convert(value, nested_parents)
+            if value is not None or print_none:
+                result[name] = value
+        for name, func, print_none in computed:
+            value = func(data, parents)
+            if value is not None or print_none:
+                result[name] = value
+        return result or None
+    return serialize
+
+
+def get_serializer(model_class, role):
+    """ Compiled serializer of raw model data in role, None if model can't be compiled """
+    key = (model_class, role)
+    if key not in serializers:
+        with serializers_lock:
+            serializers[key] = None  # recursive models aren't compiled
+            serializers[key] = compile_serializer(model_class, role)
+    return serializers[key]
@@ -9,6 +9,7 @@ from openprocurement.tender.belowthreshold.tests.award import (
     TenderAwardComplaintDocumentResourceTestMixin
 )
 
+from openprocurement.tender.limited.models import LazyListsModel
 from openprocurement.tender.limited.tests.base import (
     BaseTenderContentWebTest, test_tender_data,
     test_tender_negotiation_data,
@@ -36,6 +37,8 @@ from openprocurement.tender.limited.tests.award_blanks import (
     # TenderNegotiationAwardComplaintResourceTest
     create_tender_award_complaint_invalid,
     create_tender_negotiation_award_complaints,
+    create_tender_award_complaints_ids,
+    create_tender_award_complaint_concurrently,
     patch_tender_award_complaint,
     review_tender_award_complaint,
     review_tender_award_stopping_complaint,
@@ -53,6 +56,7 @@ from openprocurement.tender.limited.tests.award_blanks import (
     cancel_award,
     create_award_on_cancel_lot,
     patch_award_on_cancel_lot,
+    create_tender_awards_bulk,
     # TenderNegotiationAwardResourceTest
     patch_tender_award_Administrator_change,
     patch_active_not_qualified,
@@ -66,6 +70,9 @@ from openprocurement.tender.limited.tests.award_blanks import (
     patch_tender_award,
     patch_tender_award_unsuccessful,
     get_tender_award,
+    get_tender_award_not_modified,
+    get_tender_award_fields,
+    patch_tender_award_rebase,
     activate_contract_with_cancelled_award,
 )
 
@@ -82,6 +89,9 @@ class TenderAwardResourceTest(BaseTenderContentWebTest):
     test_patch_tender_award = snitch(patch_tender_award)
     test_patch_tender_award_unsuccessful = snitch(patch_tender_award_unsuccessful)
     test_get_tender_award = snitch(get_tender_award)
+    test_get_tender_award_not_modified = snitch(get_tender_award_not_modified)
+    test_get_tender_award_fields = snitch(get_tender_award_fields)
+    test_patch_tender_award_rebase = snitch(patch_tender_award_rebase)
     test_activate_contract_with_cancelled_award = snitch(activate_contract_with_cancelled_award)
 
 
@@ -119,6 +129,29 @@ class TenderNegotiationLotAwardResourceTest(TenderAwardResourceTest):
     test_cancel_award = snitch(cancel_award)
     test_create_award_on_cancel_lot = snitch(create_award_on_cancel_lot)
     test_patch_award_on_cancel_lot = snitch(patch_award_on_cancel_lot)
+    test_create_tender_awards_bulk = snitch(create_tender_awards_bulk)
+
+
+class TenderNegotiationLazyLotAwardResourceTest(TenderNegotiationLotAwardResourceTest):
+
+    def setUp(self):
+        LazyListsModel.lazy_hydration = True
+        super(TenderNegotiationLazyLotAwardResourceTest, self).setUp()
+
+    def tearDown(self):
+        LazyListsModel.lazy_hydration = False
+        super(TenderNegotiationLazyLotAwardResourceTest, self).tearDown()
+
+
+class TenderNegotiationCompactLotAwardResourceTest(TenderNegotiationLazyLotAwardResourceTest):
+
+    def setUp(self):
+        LazyListsModel.compact_lists = True
+        super(TenderNegotiationCompactLotAwardResourceTest, self).setUp()
+
+    def tearDown(self):
+        LazyListsModel.compact_lists = False
+        super(TenderNegotiationCompactLotAwardResourceTest, self).tearDown()
 
 
 class TenderNegotiationQuickAwardResourceTest(TenderNegotiationAwardResourceTest):
@@ -145,6 +178,8 @@ class TenderNegotiationAwardComplaintResourceTest(BaseTenderContentWebTest):
 
     test_create_tender_award_complaint_invalid = snitch(create_tender_award_complaint_invalid)
     test_create_tender_award_complaints = snitch(create_tender_negotiation_award_complaints)
+    test_create_tender_award_complaints_ids = snitch(create_tender_award_complaints_ids)
+    test_create_tender_award_complaint_concurrently = snitch(create_tender_award_complaint_concurrently)
     test_patch_tender_award_complaint = snitch(patch_tender_award_complaint)
     test_review_tender_award_complaint = snitch(review_tender_award_complaint)
     test_review_tender_award_stopping_complaint = snitch(review_tender_award_stopping_complaint)
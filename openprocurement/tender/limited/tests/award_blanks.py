@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
+from uuid import uuid4
+
 from openprocurement.tender.belowthreshold.tests.base import test_organization
 
+from openprocurement.tender.limited.models import ReportingTender, NegotiationTender, NegotiationQuickTender
+
 
 # TenderAwardResourceTest
 
@@ -469,6 +473,97 @@ def get_tender_award(self):
     ])
 
 
+def get_tender_award_not_modified(self):
+    response = self.app.post_json('/tenders/{}/awards?acc_token={}'.format(
+        self.tender_id, self.tender_token),
+        {'data': {'suppliers': [test_organization], 'qualified': True, 'status': 'pending'}})
+    self.assertEqual(response.status, '201 Created')
+    award = response.json['data']
+
+    for path in ['/tenders/{}/awards'.format(self.tender_id),
+                 '/tenders/{}/awards/{}'.format(self.tender_id, award['id'])]:
+        response = self.app.get(path)
+        self.assertEqual(response.status, '200 OK')
+        etag = response.headers['ETag']
+
+        response = self.app.get(path, headers={'If-None-Match': etag}, status=304)
+        self.assertEqual(response.status, '304 Not Modified')
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.body, '')
+
+    response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(
+        self.tender_id, award['id'], self.tender_token), {'data': {'title': 'award title'}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.get('/tenders/{}/awards/{}'.format(self.tender_id, award['id']),
+                            headers={'If-None-Match': etag})
+    self.assertEqual(response.status, '200 OK')
+    self.assertNotEqual(response.headers['ETag'], etag)
+    self.assertEqual(response.json['data']['title'], 'award title')
+
+
+def get_tender_award_fields(self):
+    tender_class = {'reporting': ReportingTender, 'negotiation': NegotiationTender,
+                    'negotiation.quick': NegotiationQuickTender}[self.initial_data.get('procurementMethodType', 'reporting')]
+    award_class = tender_class._fields['awards'].field.model_class
+    model_classes = [award_class, award_class._fields['value'].model_class,
+                     award_class._fields['suppliers'].field.model_class]
+    roles = [sorted(i._options.roles) for i in model_classes]
+
+    response = self.app.post_json('/tenders/{}/awards?acc_token={}'.format(
+        self.tender_id, self.tender_token),
+        {'data': {'suppliers': [test_organization], 'qualified': True, 'status': 'pending',
+                  'value': {'amount': 500}}})
+    self.assertEqual(response.status, '201 Created')
+    award = response.json['data']
+
+    response = self.app.get('/tenders/{}/awards/{}?fields=id,status,value,owner_token'.format(self.tender_id, award['id']))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'], {'id': award['id'], 'status': 'pending', 'value': award['value']})
+
+    response = self.app.get('/tenders/{}/awards?fields=id,status'.format(self.tender_id))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'], [{'id': award['id'], 'status': 'pending'}])
+
+    response = self.app.get('/tenders/{}/awards'.format(self.tender_id))
+    self.assertEqual(response.json['data'], [award])
+
+    # projections don't add roles to models shared with other procedures
+    self.assertEqual([sorted(i._options.roles) for i in model_classes], roles)
+
+
+def patch_tender_award_rebase(self):
+    response = self.app.post_json('/tenders/{}/awards?acc_token={}'.format(
+        self.tender_id, self.tender_token),
+        {'data': {'suppliers': [test_organization], 'qualified': True, 'status': 'pending'}})
+    self.assertEqual(response.status, '201 Created')
+    award = response.json['data']
+
+    db = self.app.app.registry.db
+    save = db.save
+
+    def concurrent_save(doc, *args, **kwargs):
+        db.save = save
+        tender = self.db.get(self.tender_id)
+        tender['title'] = u'concurrent title'
+        save(tender)
+        return save(doc, *args, **kwargs)
+
+    db.save = concurrent_save
+    try:
+        response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(
+            self.tender_id, award['id'], self.tender_token), {'data': {'status': 'active'}})
+    finally:
+        db.save = save
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data']['status'], 'active')
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['title'], u'concurrent title')
+    self.assertEqual(response.json['data']['awards'][0]['status'], 'active')
+    self.assertEqual(len(response.json['data']['contracts']), 1)
+
+
 def activate_contract_with_cancelled_award(self):
     response = self.app.post_json('/tenders/{}/awards?acc_token={}'.format(
         self.tender_id, self.tender_token),
@@ -583,6 +678,20 @@ def patch_active_not_qualified(self):
     self.assertEqual(response.json['errors'][0]["description"],
                      "Can't update award to active status with not qualified")
 
+    # qualification is checked before status transition
+    response = self.app.patch_json(
+        '/tenders/{}/awards/{}?acc_token={}'.format(self.tender_id, award['id'], self.tender_token),
+        {'data': {'status': 'unsuccessful'}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.patch_json(
+        '/tenders/{}/awards/{}?acc_token={}'.format(self.tender_id, award['id'], self.tender_token),
+        {'data': {'status': 'active'}},
+        status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+    self.assertEqual(response.json['errors'][0]["description"],
+                     "Can't update award to active status with not qualified")
+
 
 def create_two_awards_on_one_lot(self):
     response = self.app.post_json('/tenders/{}/lots?acc_token={}'.format(self.tender_id, self.tender_token),
@@ -1268,6 +1377,89 @@ def patch_award_on_cancel_lot(self):
     self.assertEqual(response.json['errors'][0]["description"],
                      "Can't update award while cancellation for corresponding lot exists")
 
+def create_tender_awards_bulk(self):
+    self.app.patch_json('/tenders/{}?acc_token={}'.format(self.tender_id, self.tender_token),
+                        {'data': {'items': self.test_tender_negotiation_data_local['items'] * 2}})
+    lots = []
+    for i in range(2):
+        response = self.app.post_json('/tenders/{}/lots?acc_token={}'.format(self.tender_id, self.tender_token),
+                                      {'data': self.test_lots_data[0]})
+        self.assertEqual(response.status, '201 Created')
+        lots.append(response.json['data'])
+    self.app.patch_json('/tenders/{}?acc_token={}'.format(self.tender_id, self.tender_token),
+                        {'data': {'items': [{'relatedLot': lot['id']} for lot in lots]}})
+    request_path = '/tenders/{}/bulk/awards?acc_token={}'.format(self.tender_id, self.tender_token)
+
+    response = self.app.post_json(request_path, {'data': {'suppliers': [test_organization]}}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Data not available', u'location': u'body', u'name': u'data'}
+    ])
+
+    response = self.app.post_json(request_path, {'data': [
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[0]['id']},
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': '0' * 32},
+    ]}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{}, {u'lotID': [u'lotID should be one of lots']}], u'location': u'body', u'name': u'data'}
+    ])
+
+    award_id = uuid4().hex
+    response = self.app.post_json(request_path, {'data': [
+        {'id': award_id, 'suppliers': [test_organization], 'qualified': True, 'lotID': lots[0]['id']},
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[1]['id']},
+        {'id': award_id, 'suppliers': [test_organization], 'qualified': True, 'lotID': lots[1]['id']},
+    ]}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{u'id': [u'duplicate id']}, {}, {u'id': [u'duplicate id']}],
+         u'location': u'body', u'name': u'data'}
+    ])
+
+    response = self.app.post_json(request_path, {'data': [
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[0]['id'], 'awardStatus': 'pending'},
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[1]['id']},
+    ]}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{u'awardStatus': u'Rogue field'}, {}], u'location': u'body', u'name': u'data'}
+    ])
+
+    response = self.app.post_json(request_path, {'data': [
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[0]['id']},
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[0]['id']},
+    ]}, status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{}, {u'lotID': [u"Can't create new award on lot while any (pending) award exists"]}],
+         u'location': u'body', u'name': u'data'}
+    ])
+
+    response = self.app.post_json(request_path, {'data': [
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lot['id']}
+        for lot in lots
+    ]})
+    self.assertEqual(response.status, '201 Created')
+    self.assertEqual(response.content_type, 'application/json')
+    awards = response.json['data']
+    self.assertEqual([award['lotID'] for award in awards], [lot['id'] for lot in lots])
+    self.assertEqual(set([award['status'] for award in awards]), set(['pending']))
+    self.assertIn('complaintPeriod', awards[0])
+
+    response = self.app.get('/tenders/{}/awards'.format(self.tender_id))
+    self.assertEqual([award['id'] for award in response.json['data']], [award['id'] for award in awards])
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(len(response.json['data']['awards']), 2)
+
+    response = self.app.post_json(request_path, {'data': [
+        {'suppliers': [test_organization], 'qualified': True, 'lotID': lots[1]['id']}
+    ]}, status=403)
+    self.assertEqual(response.json['errors'][0]['description'], [
+        {u'lotID': [u"Can't create new award on lot while any (pending) award exists"]}
+    ])
+
 # TenderNegotiationAwardComplaintResourceTest
 
 
@@ -1390,6 +1582,62 @@ def create_tender_award_complaint_invalid(self):
     ])
 
 
+def create_tender_award_complaints_ids(self):
+    complaint_ids = []
+    for i in range(2):
+        response = self.app.post_json('/tenders/{}/awards/{}/complaints'.format(self.tender_id, self.award_id),
+                                      {'data': {'title': 'complaint title', 'description': 'complaint description',
+                                                'author': test_organization, 'status': 'pending'}})
+        self.assertEqual(response.status, '201 Created')
+        complaint_ids.append(response.json['data']['complaintID'])
+
+    self.assertTrue(complaint_ids[0].endswith('1'))
+    self.assertEqual(complaint_ids[1], complaint_ids[0][:-1] + '2')
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.status, '200 OK')
+    self.assertNotIn('sequences', response.json['data'])
+    for name, role in NegotiationTender._options.roles.items():
+        if name != 'default':  # used for storage
+            self.assertTrue(role('sequences', {}), name)
+
+
+def create_tender_award_complaint_concurrently(self):
+    db = self.app.app.registry.db
+    save = db.save
+
+    def concurrent_save(doc, *args, **kwargs):
+        db.save = save
+        tender = self.db.get(self.tender_id)
+        award = [i for i in tender['awards'] if i['id'] == self.award_id][0]
+        award.setdefault('complaints', []).append({
+            'id': uuid4().hex, 'complaintID': '{}.1'.format(tender['tenderID']), 'status': 'pending',
+            'title': 'concurrent complaint', 'author': test_organization})
+        tender['sequences'] = {'complaints': 1}
+        save(tender)
+        return save(doc, *args, **kwargs)
+
+    db.save = concurrent_save
+    try:
+        response = self.app.post_json('/tenders/{}/awards/{}/complaints'.format(self.tender_id, self.award_id),
+                                      {'data': {'title': 'complaint title', 'description': 'complaint description',
+                                                'author': test_organization, 'status': 'pending'}})
+    finally:
+        db.save = save
+    self.assertEqual(response.status, '201 Created')
+    self.assertTrue(response.json['data']['complaintID'].endswith('2'))
+    complaint = response.json
+
+    response = self.app.patch_json('/tenders/{}/awards/{}/complaints/{}?acc_token={}'.format(
+        self.tender_id, self.award_id, complaint['data']['id'], complaint['access']['token']),
+        {'data': {'status': 'stopping', 'cancellationReason': 'reason'}})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data']['status'], 'stopping')
+
+    response = self.app.get('/tenders/{}/awards/{}/complaints'.format(self.tender_id, self.award_id))
+    self.assertEqual([i['title'] for i in response.json['data']], ['concurrent complaint', 'complaint title'])
+
+
 def create_tender_negotiation_award_complaints(self):
 
     response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(self.tender_id, self.award_id,
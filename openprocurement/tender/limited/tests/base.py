@@ -10,6 +10,7 @@ from openprocurement.tender.belowthreshold.tests.base import (
 from openprocurement.tender.belowthreshold.tests.base import (
     BaseTenderWebTest as BaseBaseTenderWebTest
 )
+from openprocurement.tender.limited.tests.memorydb import memory_couchdb
 
 now = datetime.now()
 test_tender_data = base_data.copy()
@@ -66,6 +67,15 @@ class BaseTenderWebTest(BaseBaseTenderWebTest):
     primary_tender_status = "active"  # status, to which tender should be switched from 'draft'
     forbidden_document_modification_actions_status = "complete"  # status, in which operations with tender documents (adding, updating) are forbidden
     forbidden_contract_document_modification_actions_status = "complete"  # status, in which operations with tender's contract documents (adding, updating) are forbidden
+    db_backend = os.environ.get('DB_BACKEND', 'couchdb')  # 'memory' to run without CouchDB server
+
+    @classmethod
+    def setUpClass(cls):
+        if cls.db_backend == 'memory':
+            with memory_couchdb():
+                super(BaseTenderWebTest, cls).setUpClass()
+        else:
+            super(BaseTenderWebTest, cls).setUpClass()
 
     def set_status(self, status, extra=None):
         data = {'status': status}
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+""" Revision conflicts of concurrent award PATCHes on distinct lots of one
+    negotiation tender, without and with the per-tender write queue.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.conflicts [awards] [rounds]
+"""
+import json
+import sys
+from threading import Event, Thread
+from time import time
+from uuid import uuid4
+
+from openprocurement.tender.limited.tests.benchmarks.generator import generate_tender_data
+from openprocurement.tender.limited.tests.benchmarks.load import create_app
+
+
+def patch_awards(app, tender, token, n):
+    start = Event()
+    statuses = []
+
+    def patch(award):
+        start.wait()
+        response = app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(tender['_id'], award['id'], token),
+                                  {'data': {'title': 'award {}'.format(n)}}, status='*')
+        statuses.append(response.status_int)
+
+    threads = [Thread(target=patch, args=(award,)) for award in tender['awards']]
+    for thread in threads:
+        thread.start()
+    started = time()
+    start.set()
+    for thread in threads:
+        thread.join()
+    return statuses, time() - started
+
+
+def measure(app, awards, rounds):
+    token = uuid4().hex
+    tender = generate_tender_data('negotiation', lots=awards, items=awards, awards=awards, contracts=0,
+                                  owner_token=token)
+    app.app.registry.db.save(tender)
+    result = {'requests': 0, 'ok': 0, 'conflicts': 0, 'errors': 0, 'seconds': 0.0}
+    for n in range(rounds):
+        statuses, seconds = patch_awards(app, tender, token, n)
+        result['requests'] += len(statuses)
+        result['ok'] += statuses.count(200)
+        result['conflicts'] += statuses.count(409)
+        result['errors'] += len(statuses) - statuses.count(200) - statuses.count(409)
+        result['seconds'] += seconds
+    result['conflict_rate'] = round(float(result['conflicts']) / result['requests'], 3)
+    result['seconds'] = round(result['seconds'], 3)
+    return result
+
+
+def main(awards=20, rounds=10):
+    without_queue = measure(create_app(), awards, rounds)
+    with_queue = measure(create_app(**{'limited.write_queue': 'true'}), awards, rounds)
+    return {'awards': awards, 'rounds': rounds, 'without_queue': without_queue, 'with_queue': with_queue}
+
+
+if __name__ == '__main__':
+    print(json.dumps(main(*[int(i) for i in sys.argv[1:3]]), indent=2, sort_keys=True))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+""" Synthetic large tenders of limited procedures in stored (CouchDB) form. """
+from copy import deepcopy
+from hashlib import md5
+from uuid import uuid4
+
+from openprocurement.api.utils import get_now
+from openprocurement.tender.belowthreshold.tests.base import test_organization
+from openprocurement.tender.limited.models import ReportingTender, NegotiationTender, NegotiationQuickTender
+from openprocurement.tender.limited.tests.base import (
+    test_tender_data,
+    test_tender_negotiation_data,
+    test_tender_negotiation_quick_data,
+    test_lots
+)
+
+PROCEDURES = {
+    'reporting': (ReportingTender, test_tender_data),
+    'negotiation': (NegotiationTender, test_tender_negotiation_data),
+    'negotiation.quick': (NegotiationQuickTender, test_tender_negotiation_quick_data),
+}
+
+
+def generate_documents(count, now):
+    return [
+        {
+            'id': uuid4().hex,
+            'title': 'document{}.pdf'.format(i),
+            'format': 'application/pdf',
+            'url': 'http://localhost/get/{}'.format(uuid4().hex),
+            'hash': 'md5:{}'.format(md5(str(i)).hexdigest()),
+            'datePublished': now,
+            'dateModified': now,
+        }
+        for i in range(count)
+    ]
+
+
+def generate_tender_data(procurementMethodType='negotiation', lots=10, items=10, awards=10, complaints=0,
+                         contracts=9, documents=0, owner_token=None):
+    """ Stored tender with given numbers of objects
+
+    ``complaints`` and ``documents`` are counted per award (documents also
+    per tender and per contract). Award ``i`` relates to lot ``i`` and is
+    active with a pending contract for ``i < contracts``, other awards are
+    pending. Reporting tenders have no lots.
+    """
+    model, initial_data = PROCEDURES[procurementMethodType]
+    if procurementMethodType == 'reporting':
+        lots = 0
+    elif awards > lots:
+        raise ValueError('Negotiation tender needs a lot per award')
+    if contracts > awards:
+        raise ValueError('Contract needs an active award')
+    now = get_now().isoformat()
+    tender_id = uuid4().hex
+    data = deepcopy(initial_data)
+    data.update({
+        'id': tender_id,
+        'tenderID': 'UA-BENCHMARK-{}'.format(tender_id[:8]),
+        'status': 'active',
+        'date': now,
+        'dateModified': now,
+        'owner': 'broker',
+        'owner_token': owner_token or uuid4().hex,
+        'documents': generate_documents(documents, now),
+        'lots': [
+            dict(deepcopy(test_lots[0]), id=uuid4().hex, status='active', date=now)
+            for i in range(lots)
+        ],
+        'items': [],
+        'awards': [],
+        'contracts': [],
+    })
+    for i in range(items):
+        item = dict(deepcopy(initial_data['items'][0]), id=uuid4().hex)
+        if lots:
+            item['relatedLot'] = data['lots'][i % lots]['id']
+        data['items'].append(item)
+    for i in range(awards):
+        lot = data['lots'][i] if lots else None
+        award = {
+            'id': uuid4().hex,
+            'status': 'active' if i < contracts else 'pending',
+            'qualified': True,
+            'date': now,
+            'suppliers': [deepcopy(test_organization)],
+            'value': deepcopy(initial_data['value']),
+            'documents': generate_documents(documents, now),
+            'complaints': [
+                {
+                    'id': uuid4().hex,
+                    'complaintID': '{}.{}{}'.format(data['tenderID'], i, j),
+                    'status': 'pending',
+                    'title': 'complaint title',
+                    'author': deepcopy(test_organization),
+                    'date': now,
+                    'dateSubmitted': now,
+                }
+                for j in range(complaints)
+            ],
+            'complaintPeriod': {'startDate': now, 'endDate': now},
+        }
+        if lot:
+            award['lotID'] = lot['id']
+        data['awards'].append(award)
+        if i < contracts:
+            data['contracts'].append({
+                'id': uuid4().hex,
+                'awardID': award['id'],
+                'contractID': '{}-{}'.format(data['tenderID'], i + 1),
+                'status': 'pending',
+                'date': now,
+                'suppliers': award['suppliers'],
+                'value': award['value'],
+                'documents': generate_documents(documents, now),
+                'items': [
+                    item for item in data['items']
+                    if not lot or item.get('relatedLot') == lot['id']
+                ],
+            })
+    if not lots:
+        del data['lots']
+    stored = model(data).to_primitive()
+    stored.update({'_id': tender_id, 'doc_type': 'Tender'})
+    stored.pop('id', None)
+    return stored
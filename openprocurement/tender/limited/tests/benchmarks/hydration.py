@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+""" Latency of single-object reads of negotiation tenders with growing
+    sibling collections, with eager and lazy model hydration.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.hydration [max siblings] [repeat]
+"""
+import json
+import sys
+from uuid import uuid4
+
+from openprocurement.tender.limited.models import LazyListsModel
+from openprocurement.tender.limited.tests.benchmarks.generator import generate_tender_data
+from openprocurement.tender.limited.tests.benchmarks.load import create_app, measure
+
+
+def get_endpoints(tender):
+    tender_url = '/tenders/{}'.format(tender['_id'])
+    return [
+        ('GET /tenders/{id}/awards/{award_id}', '{}/awards/{}'.format(tender_url, tender['awards'][0]['id'])),
+        ('GET /tenders/{id}/contracts/{contract_id}/documents',
+         '{}/contracts/{}/documents'.format(tender_url, tender['contracts'][0]['id'])),
+    ]
+
+
+def main(max_siblings=1000, repeat=20):
+    app = create_app()
+    results = {}
+    siblings = 10
+    while siblings <= max_siblings:
+        tender = generate_tender_data('negotiation', lots=siblings, items=siblings, awards=siblings,
+                                      complaints=2, contracts=siblings, documents=5, owner_token=uuid4().hex)
+        app.app.registry.db.save(tender)
+        for name, url in get_endpoints(tender):
+            for mode, lazy in (('eager', False), ('lazy', True)):
+                LazyListsModel.lazy_hydration = lazy
+                summary = measure(app, 'get', url, None, repeat)
+                results.setdefault(name, {}).setdefault(mode, {})[siblings] = summary['p50']
+        siblings *= 10
+    LazyListsModel.lazy_hydration = False
+    return {'repeat': repeat, 'p50': results}
+
+
+if __name__ == '__main__':
+    print(json.dumps(main(*[int(i) for i in sys.argv[1:3]]), indent=2, sort_keys=True))
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+""" Latency of limited API endpoints on large synthetic tenders.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.load --lots 100 --repeat 50 > results.json
+    python -m openprocurement.tender.limited.tests.benchmarks.load --baseline results.json
+
+Requests go through the real application (WebTest) backed by the
+in-memory CouchDB stand-in, so results depend on API code only. Output is
+JSON with latency percentiles (ms) per procedure and endpoint; with
+``--baseline`` p50 of each endpoint is also compared to earlier results.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from math import ceil
+from time import time
+from uuid import uuid4
+
+import webtest
+from paste.deploy import appconfig
+
+from openprocurement.api.app import main as make_app
+from openprocurement.api.tests.base import PrefixedRequestClass
+from openprocurement.tender.limited.tests.benchmarks.generator import PROCEDURES, generate_tender_data
+from openprocurement.tender.limited.tests.memorydb import memory_couchdb
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 90, 99)
+
+
+def create_app(**settings):
+    """ Test application from tests.ini, ``settings`` override the ini ones """
+    with memory_couchdb():
+        if settings:
+            app = webtest.TestApp(make_app({}, **dict(appconfig('config:tests.ini', relative_to=TESTS_DIR), **settings)))
+        else:
+            app = webtest.TestApp("config:tests.ini", relative_to=TESTS_DIR)
+    app.RequestClass = PrefixedRequestClass
+    app.authorization = ('Basic', ('broker', ''))
+    return app
+
+
+def get_endpoints(tender, token):
+    """ (name, method, url, kwargs factory) of endpoints to measure """
+    tender_url = '/tenders/{}'.format(tender['_id'])
+    award = tender['awards'][-1]
+    contract = tender['contracts'][-1] if tender['contracts'] else None
+    endpoints = [
+        ('GET /tenders/{id}', 'get', tender_url, None),
+        ('GET /tenders/{id}/documents', 'get', tender_url + '/documents', None),
+        ('GET /tenders/{id}/awards', 'get', tender_url + '/awards', None),
+        ('GET /tenders/{id}/awards/{award_id}', 'get', '{}/awards/{}'.format(tender_url, award['id']), None),
+        ('GET /tenders/{id}/awards/{award_id}/documents', 'get',
+         '{}/awards/{}/documents'.format(tender_url, award['id']), None),
+        ('GET /tenders/{id}/contracts', 'get', tender_url + '/contracts', None),
+    ]
+    if tender['procurementMethodType'] != 'reporting':
+        endpoints.extend([
+            ('GET /tenders/{id}/lots', 'get', tender_url + '/lots', None),
+            ('GET /tenders/{id}/awards/{award_id}/complaints', 'get',
+             '{}/awards/{}/complaints'.format(tender_url, award['id']), None),
+        ])
+    if contract:
+        endpoints.extend([
+            ('GET /tenders/{id}/contracts/{contract_id}', 'get',
+             '{}/contracts/{}'.format(tender_url, contract['id']), None),
+            ('GET /tenders/{id}/contracts/{contract_id}/documents', 'get',
+             '{}/contracts/{}/documents'.format(tender_url, contract['id']), None),
+            ('PATCH /tenders/{id}/contracts/{contract_id}', 'patch_json',
+             '{}/contracts/{}?acc_token={}'.format(tender_url, contract['id'], token),
+             lambda n: {'params': {'data': {'title': 'contract {}'.format(n)}}}),
+        ])
+    if award['status'] == 'pending':
+        endpoints.append(
+            ('PATCH /tenders/{id}/awards/{award_id}', 'patch_json',
+             '{}/awards/{}?acc_token={}'.format(tender_url, award['id'], token),
+             lambda n: {'params': {'data': {'title': 'award {}'.format(n)}}}))
+    endpoints.append(
+        ('POST /tenders/{id}/documents', 'post',
+         '{}/documents?acc_token={}'.format(tender_url, token),
+         lambda n: {'upload_files': [('file', 'document{}.doc'.format(n), 'content')]}))
+    return endpoints
+
+
+def percentile(values, p):
+    return values[max(int(ceil(p / 100.0 * len(values))) - 1, 0)]
+
+
+def summarize(durations):
+    values = sorted(i * 1000 for i in durations)
+    summary = {
+        'count': len(values),
+        'mean': round(sum(values) / len(values), 3),
+        'min': round(values[0], 3),
+        'max': round(values[-1], 3),
+    }
+    for p in PERCENTILES:
+        summary['p{}'.format(p)] = round(percentile(values, p), 3)
+    return summary
+
+
+def measure(app, method, url, kwargs, repeat):
+    durations = []
+    for n in range(repeat + 1):
+        request_kwargs = kwargs(n) if kwargs else {}
+        start = time()
+        getattr(app, method)(url, **request_kwargs)
+        if n:  # first request warms up caches
+            durations.append(time() - start)
+    return summarize(durations)
+
+
+def compare(results, baseline):
+    for procedure, endpoints in results.items():
+        for name, summary in endpoints.items():
+            previous = baseline.get('results', {}).get(procedure, {}).get(name)
+            if previous:
+                summary['p50_change'] = round(summary['p50'] / previous['p50'], 3)
+
+
+def main(lots=100, items=100, awards=100, complaints=2, contracts=99, documents=5, repeat=50,
+         procedures=tuple(PROCEDURES), baseline=None):
+    app = create_app()
+    db = app.app.registry.db
+    params = {
+        'lots': lots, 'items': items, 'awards': awards, 'complaints': complaints,
+        'contracts': contracts, 'documents': documents, 'repeat': repeat,
+    }
+    results = {}
+    for procedure in procedures:
+        token = uuid4().hex
+        tender = generate_tender_data(procedure, lots=lots, items=items, awards=awards, complaints=complaints,
+                                      contracts=contracts, documents=documents, owner_token=token)
+        db.save(tender)
+        results[procedure] = dict([
+            (name, measure(app, method, url, kwargs, repeat))
+            for name, method, url, kwargs in get_endpoints(tender, token)
+        ])
+    output = {'python': platform.python_version(), 'params': params, 'results': results}
+    if baseline:
+        compare(results, baseline)
+    return output
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--lots', type=int, default=100)
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--awards', type=int, default=100)
+    parser.add_argument('--complaints', type=int, default=2, help='per award')
+    parser.add_argument('--contracts', type=int, default=99)
+    parser.add_argument('--documents', type=int, default=5, help='per tender, award and contract')
+    parser.add_argument('--repeat', type=int, default=50, help='requests per endpoint')
+    parser.add_argument('--procedure', action='append', choices=sorted(PROCEDURES), dest='procedures')
+    parser.add_argument('--baseline', type=argparse.FileType('r'), help='results of earlier run to compare with')
+    args = vars(parser.parse_args(argv))
+    args['procedures'] = args['procedures'] or tuple(PROCEDURES)
+    args['baseline'] = json.load(args['baseline']) if args['baseline'] else None
+    return args
+
+
+if __name__ == '__main__':
+    print(json.dumps(main(**parse_args(sys.argv[1:])), indent=2, sort_keys=True))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+""" Resident memory of large negotiation tenders loaded as for requests,
+    with eager models, lazy hydration and lazy hydration with compact lists.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.memory [lots] [tenders]
+
+Each mode runs in a fresh interpreter, which loads ``tenders`` copies of
+the stored tender one by one, as concurrent requests would, and keeps
+them alive. Output is RSS growth per tender (MB) after loading (as for
+tender sub-object reads) and after awards are hydrated (as for award
+requests). RSS is read from /proc, so Linux only.
+"""
+import gc
+import json
+import resource
+import subprocess
+import sys
+
+from openprocurement.tender.limited.models import NegotiationTender, LazyListsModel
+from openprocurement.tender.limited.tests.benchmarks.generator import generate_tender_data
+
+MODULE = 'openprocurement.tender.limited.tests.benchmarks.memory'
+MODES = {
+    'eager': (False, False),
+    'lazy': (True, False),
+    'compact': (True, True),
+}
+
+
+def rss():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def measure(mode, lots, tenders):
+    LazyListsModel.lazy_hydration, LazyListsModel.compact_lists = MODES[mode]
+    stored = json.dumps(generate_tender_data('negotiation', lots=lots, items=lots, awards=lots, complaints=2,
+                                             contracts=lots, documents=5))
+    gc.collect()
+    start = rss()
+    loaded = [NegotiationTender(json.loads(stored)) for i in range(tenders)]
+    gc.collect()
+    load = rss()
+    for tender in loaded:
+        tender.awards
+    gc.collect()
+    awards = rss()
+    return {
+        'load': round((load - start) / 1e6 / tenders, 3),
+        'awards': round((awards - start) / 1e6 / tenders, 3),
+    }
+
+
+def main(lots=1000, tenders=5):
+    results = {}
+    for mode in sorted(MODES):
+        output = subprocess.check_output([sys.executable, '-m', MODULE, mode, str(lots), str(tenders)])
+        results[mode] = json.loads(output)
+    return {'lots': lots, 'tenders': tenders, 'rss_mb_per_tender': results}
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] and sys.argv[1] in MODES:
+        print(json.dumps(measure(sys.argv[1], *[int(i) for i in sys.argv[2:4]])))
+    else:
+        print(json.dumps(main(*[int(i) for i in sys.argv[1:3]]), indent=2, sort_keys=True))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+""" Full, projected (``?fields=``) and raw (compiled serializer over stored
+    data) serialization of lots, awards and contracts of a large negotiation
+    tender. Models with documents have no compiled serializer, their raw
+    results are null.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.serialization [lots] [repeat]
+"""
+import json
+import sys
+from timeit import repeat
+
+from openprocurement.tender.limited.models import NegotiationTender
+from openprocurement.tender.limited.serializers import get_serializer
+from openprocurement.tender.limited.tests.benchmarks.generator import generate_tender_data
+from openprocurement.tender.limited.utils import get_projection, serialize_projection
+
+FIELDS = ['id', 'status', 'lotID', 'value']
+
+
+def generate_tender(lots):
+    return generate_tender_data('negotiation', lots=lots, items=lots, awards=lots, contracts=lots)
+
+
+def measure(tender, data, name, role, number):
+    items = getattr(tender, name)
+    projection = get_projection(type(items[0]), FIELDS, role)
+    raw_serialize = get_serializer(type(items[0]), role)
+    parents = ((type(tender), tender),)
+    full = min(repeat(lambda: [i.serialize(role) for i in items], number=1, repeat=number))
+    fields = min(repeat(lambda: [serialize_projection(i, projection, role) for i in items], number=1, repeat=number))
+    result = {'full': full, 'fields': fields, 'raw': None, 'speedup': full / fields, 'raw_speedup': None}
+    if raw_serialize is not None:
+        result['raw'] = min(repeat(lambda: [raw_serialize(i, parents) for i in data[name]], number=1, repeat=number))
+        result['raw_speedup'] = full / result['raw']
+    return result
+
+
+def main(lots=1000, number=5):
+    data = generate_tender(lots)
+    tender = NegotiationTender(data)
+    return {
+        'tender_lots': lots,
+        'fields': FIELDS,
+        'lots': measure(tender, data, 'lots', 'view', number),
+        'awards': measure(tender, data, 'awards', 'view', number),
+        'contracts': measure(tender, data, 'contracts', None, number),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(main(*[int(i) for i in sys.argv[1:3]]), indent=2))
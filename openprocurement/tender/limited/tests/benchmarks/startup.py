@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+""" Application startup time and number of registered views with one,
+    two and all three limited plugins enabled.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.startup [repeat]
+
+Each run is a fresh interpreter building the application from tests.ini
+with the given plugins, backed by the in-memory CouchDB stand-in. Output
+is the time of the application factory (ms, min and max of runs) and the
+number of registered views.
+"""
+import json
+import subprocess
+import sys
+from time import time
+
+from paste.deploy import appconfig
+
+from openprocurement.api.app import main as make_app
+from openprocurement.tender.limited.tests.benchmarks.load import TESTS_DIR
+from openprocurement.tender.limited.tests.memorydb import memory_couchdb
+
+MODULE = 'openprocurement.tender.limited.tests.benchmarks.startup'
+PLUGINS = {  # one, two and three enabled limited types
+    '1_reporting': 'api,tender_core,reporting',
+    '1_negotiation': 'api,tender_core,negotiation',
+    '2_reporting_negotiation': 'api,tender_core,reporting,negotiation',
+    '2_negotiation_quick': 'api,tender_core,negotiation,negotiation.quick',
+    '3_limited': 'api,tender_core,reporting,negotiation,negotiation.quick',
+}
+
+
+def startup(plugins):
+    settings = dict(appconfig('config:tests.ini', relative_to=TESTS_DIR), plugins=plugins)
+    start = time()
+    with memory_couchdb():
+        app = make_app({}, **settings)
+    return {
+        'ms': round((time() - start) * 1000, 3),
+        'views': len(app.registry.introspector.get_category('views') or []),
+    }
+
+
+def main(repeat=5):
+    results = {}
+    for name, plugins in sorted(PLUGINS.items()):
+        runs = [
+            json.loads(subprocess.check_output([sys.executable, '-m', MODULE, '--plugins', plugins]))
+            for i in range(repeat)
+        ]
+        results[name] = {
+            'plugins': plugins,
+            'min_ms': min([i['ms'] for i in runs]),
+            'max_ms': max([i['ms'] for i in runs]),
+            'views': runs[0]['views'],
+        }
+    return results
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--plugins']:
+        print(json.dumps(startup(sys.argv[2])))
+    else:
+        print(json.dumps(main(*[int(i) for i in sys.argv[1:2]]), indent=2, sort_keys=True))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+""" Serialization of contracts whose item unit values inherit currency and
+    VAT from the contract, by number of items per contract, with inherited
+    values memoised per serialization (as the API does) and without.
+
+    python -m openprocurement.tender.limited.tests.benchmarks.values [max items] [repeat]
+"""
+import json
+import sys
+from timeit import repeat
+
+from openprocurement.tender.limited.models import ReportingTender, LazyListsModel
+from openprocurement.tender.limited.tests.benchmarks.generator import generate_tender_data
+
+
+def generate_tender(items):
+    data = generate_tender_data('reporting', items=items, awards=1, contracts=1)
+    for item in data['items'] + data['contracts'][0]['items']:
+        item['unit'] = dict(item.get('unit', {}), value={'amount': 10})
+    return ReportingTender(data)
+
+
+def main(max_items=1000, number=20):
+    results = {}
+    items = 10
+    while items <= max_items:
+        contract = generate_tender(items).contracts[0]
+        scoped = min(repeat(lambda: contract.serialize('view'), number=1, repeat=number))
+        # model serialization bypassing the scope of LazyListsModel.serialize
+        unscoped = min(repeat(lambda: super(LazyListsModel, contract).serialize('view'), number=1, repeat=number))
+        results[items] = {
+            'seconds': scoped,
+            'per_item_us': round(scoped / items * 1e6, 3),
+            'unscoped_seconds': unscoped,
+            'speedup': round(unscoped / scoped, 3),
+        }
+        items *= 10
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(main(*[int(i) for i in sys.argv[1:3]]), indent=2, sort_keys=True))
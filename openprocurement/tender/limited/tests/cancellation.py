@@ -34,6 +34,7 @@ from openprocurement.tender.limited.tests.cancellation_blanks import (
     cancellation_on_not_active_lot,
     # TenderNegotiationCancellationResourceTest
     negotiation_create_cancellation_on_lot,
+    get_tender_cancellation_fields,
     # TenderCancellationResourceTest
     create_tender_cancellation_invalid,
     create_tender_cancellation,
@@ -58,6 +59,7 @@ class TenderNegotiationCancellationResourceTest(TenderCancellationResourceTest):
     initial_data = test_tender_negotiation_data
 
     test_create_cancellation_on_lot = snitch(negotiation_create_cancellation_on_lot)
+    test_get_tender_cancellation_fields = snitch(get_tender_cancellation_fields)
 
 
 class TenderNegotiationQuickCancellationResourceTest(TenderNegotiationCancellationResourceTest):
@@ -190,6 +190,20 @@ def create_cancellation_on_lot(self):
 # TenderNegotiationCancellationResourceTest
 
 
+def get_tender_cancellation_fields(self):
+    response = self.app.post_json('/tenders/{}/cancellations?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': {'reason': 'cancellation reason'}})
+    self.assertEqual(response.status, '201 Created')
+    cancellation = response.json['data']
+
+    response = self.app.get('/tenders/{}/cancellations/{}?fields=id,status'.format(self.tender_id, cancellation['id']))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'], {'id': cancellation['id'], 'status': cancellation['status']})
+
+    response = self.app.get('/tenders/{}/cancellations/{}'.format(self.tender_id, cancellation['id']))
+    self.assertEqual(response.json['data'], cancellation)
+
+
 def negotiation_create_cancellation_on_lot(self):
         """ Try create cancellation with cancellationOf = lot while tender hasn't lots """
         response = self.app.post_json('/tenders/{}/cancellations?acc_token={}'.format(self.tender_id,
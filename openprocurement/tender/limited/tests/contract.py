@@ -23,6 +23,10 @@ from openprocurement.tender.limited.tests.contract_blanks import (
     # TenderNegotiationLot2ContractResourceTest
     sign_second_contract,
     create_two_contract,
+    contract_ids_sequence,
+    sign_contracts_bulk,
+    check_tender_status_against_full_recalculation,
+    patch_contract_updates_only_its_lot,
     # TenderNegotiationLotContractResourceTest
     lot_items,
     lot_award_id_change_is_not_allowed,
@@ -31,10 +35,12 @@ from openprocurement.tender.limited.tests.contract_blanks import (
     patch_tender_negotiation_contract,
     tender_negotiation_contract_signature_date,
     items,
+    items_stored_as_references,
     # TenderContractResourceTest
     create_tender_contract,
     patch_tender_contract,
     tender_contract_signature_date,
+    patch_tender_contract_rebase,
     award_id_change_is_not_allowed,
 )
 
@@ -64,6 +70,7 @@ class TenderContractResourceTest(BaseTenderContentWebTest, TenderContractResourc
     test_patch_tender_contract = snitch(patch_tender_contract)
     test_tender_contract_signature_date = snitch(tender_contract_signature_date)
     test_award_id_change_is_not_allowed = snitch(award_id_change_is_not_allowed)
+    test_patch_tender_contract_rebase = snitch(patch_tender_contract_rebase)
 
 
 class TenderNegotiationContractResourceTest(TenderContractResourceTest):
@@ -73,6 +80,7 @@ class TenderNegotiationContractResourceTest(TenderContractResourceTest):
     test_patch_tender_contract = snitch(patch_tender_negotiation_contract)
     test_tender_contract_signature_date = snitch(tender_negotiation_contract_signature_date)
     test_items = snitch(items)
+    test_items_stored_as_references = snitch(items_stored_as_references)
 
 
 class TenderNegotiationLotContractResourceTest(TenderNegotiationContractResourceTest):
@@ -173,6 +181,10 @@ class TenderNegotiationLot2ContractResourceTest(BaseTenderContentWebTest):
 
     test_sign_second_contract = snitch(sign_second_contract)
     test_create_two_contract = snitch(create_two_contract)
+    test_check_tender_status_against_full_recalculation = snitch(check_tender_status_against_full_recalculation)
+    test_patch_contract_updates_only_its_lot = snitch(patch_contract_updates_only_its_lot)
+    test_contract_ids_sequence = snitch(contract_ids_sequence)
+    test_sign_contracts_bulk = snitch(sign_contracts_bulk)
 
 
 class TenderNegotiationQuickContractResourceTest(TenderNegotiationContractResourceTest):
@@ -9,6 +9,9 @@ from openprocurement.api.constants import SANDBOX_MODE
 
 from openprocurement.tender.belowthreshold.tests.base import test_organization
 
+from openprocurement.tender.limited.models import NegotiationTender, ReportingTender
+from openprocurement.tender.limited.views.contract import check_tender_negotiation_status
+
 
 # TenderContractResourceTest
 
@@ -272,6 +275,68 @@ def get_tender_contracts(self):
     ])
 
 
+def patch_tender_contract_rebase(self):
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    contract = response.json['data'][0]
+    db = self.app.app.registry.db
+    save = db.save
+
+    def concurrent_save_with(change):
+        def concurrent_save(doc, *args, **kwargs):
+            db.save = save
+            tender = self.db.get(self.tender_id)
+            change(tender)
+            save(tender)
+            return save(doc, *args, **kwargs)
+        return concurrent_save
+
+    def change_title(tender):
+        tender['title'] = u'concurrent title'
+
+    db.save = concurrent_save_with(change_title)
+    try:
+        response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+            self.tender_id, contract['id'], self.tender_token), {'data': {'title': u'rebased title'}})
+    finally:
+        db.save = save
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data']['title'], u'rebased title')
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['title'], u'concurrent title')
+    self.assertEqual(response.json['data']['contracts'][0]['title'], u'rebased title')
+
+    def change_contract_description(tender):
+        tender['contracts'][0]['description'] = u'concurrent description'
+
+    db.save = concurrent_save_with(change_contract_description)
+    try:
+        response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+            self.tender_id, contract['id'], self.tender_token), {'data': {'title': u'rebased title 2'}})
+    finally:
+        db.save = save
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data']['title'], u'rebased title 2')
+    self.assertEqual(response.json['data']['description'], u'concurrent description')
+    response = self.app.get('/tenders/{}/contracts/{}'.format(self.tender_id, contract['id']))
+    self.assertEqual(response.json['data']['title'], u'rebased title 2')
+    self.assertEqual(response.json['data']['description'], u'concurrent description')
+
+    def cancel_contract(tender):
+        tender['contracts'][0]['status'] = 'cancelled'
+
+    db.save = concurrent_save_with(cancel_contract)
+    try:
+        response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+            self.tender_id, contract['id'], self.tender_token), {'data': {'title': u'lost title'}}, status=403)
+    finally:
+        db.save = save
+    self.assertEqual(response.status, '403 Forbidden')
+    self.assertEqual(response.json['errors'][0]["description"], "Can't update contract in current (cancelled) status")
+    response = self.app.get('/tenders/{}/contracts/{}'.format(self.tender_id, contract['id']))
+    self.assertEqual(response.json['data']['status'], 'cancelled')
+    self.assertEqual(response.json['data']['title'], u'rebased title 2')
+
+
 def award_id_change_is_not_allowed(self):
     response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(
         self.tender_id, self.award_id, self.tender_token), {"data": {"status": "cancelled"}})
@@ -494,6 +559,36 @@ def items(self):
     self.assertEqual([item['id'] for item in response.json['data'][0]['items']],
                      [item['id'] for item in tender['items']])
 
+
+def items_stored_as_references(self):
+    stored = self.db.get(self.tender_id)
+    self.assertIn('classification', stored['contracts'][0]['items'][0])
+    self.assertNotIn('contractItemReferences', stored)
+
+    ReportingTender.contract_item_references = True
+    try:
+        response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+            self.tender_id, stored['contracts'][0]['id'], self.tender_token), {"data": {"title": "contract title"}})
+        self.assertEqual(response.status, '200 OK')
+    finally:
+        ReportingTender.contract_item_references = False
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    tender = response.json['data']
+
+    stored = self.db.get(self.tender_id)
+    self.assertTrue(stored['contractItemReferences'])
+    item_ids = [item['id'] for item in stored['contracts'][0]['items']]
+    for item in stored['contracts'][0]['items']:
+        self.assertLessEqual(set(item), set(['id', 'unit']))
+
+    items = [item for item in tender['items'] if item['id'] in item_ids]
+    response = self.app.get('/tenders/{}/contracts/{}'.format(self.tender_id, stored['contracts'][0]['id']))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data']['items'], items)
+    self.assertEqual(tender['contracts'][0]['items'], items)
+    self.assertIn('classification', ReportingTender(stored).to_primitive()['contracts'][0]['items'][0])
+
 # TenderNegotiationLotContractResourceTest
 
 
@@ -671,6 +766,141 @@ def create_two_contract(self):
                                   status=403)
     self.assertEqual(response.status, '403 Forbidden')
 
+def sign_contracts_bulk(self):
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    contract_ids = [i['id'] for i in response.json['data']]
+    data = [{'id': i, 'status': 'active'} for i in contract_ids]
+
+    response = self.app.patch_json('/tenders/{}/bulk/contracts?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': data + [{'id': 'some_id'}]}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'][0]['description'],
+                     [{}, {}, {'id': ['id should be one of contracts']}])
+
+    response = self.app.patch_json('/tenders/{}/bulk/contracts?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': data + data[:1]}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'][0]['description'],
+                     [{'id': ['duplicate id']}, {}, {'id': ['duplicate id']}])
+
+    response = self.app.patch_json('/tenders/{}/bulk/contracts?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': data}, status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+    self.assertEqual(len(response.json['errors'][0]['description']), 2)
+    for error in response.json['errors'][0]['description']:
+        self.assertIn("Can't sign contract before stand-still period end", error['status'][0])
+
+    # time travel
+    tender = self.db.get(self.tender_id)
+    for i in tender.get('awards', []):
+        i['complaintPeriod']['endDate'] = i['complaintPeriod']['startDate']
+    self.db.save(tender)
+
+    response = self.app.patch_json('/tenders/{}/bulk/contracts?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': data})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual([i['status'] for i in response.json['data']], ['active', 'active'])
+    self.assertTrue(all([i['dateSigned'] for i in response.json['data']]))
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['status'], 'complete')
+    self.assertEqual([i['status'] for i in response.json['data']['lots']], ['complete', 'complete'])
+
+
+def contract_ids_sequence(self):
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    contract_ids = [i['contractID'] for i in response.json['data']]
+    self.assertEqual(contract_ids[1], contract_ids[0][:-1] + '2')
+
+    # tender stored before contract ID sequence was introduced
+    tender = self.db.get(self.tender_id)
+    del tender['sequences']
+    self.db.save(tender)
+
+    response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(
+        self.tender_id, self.award2_id, self.tender_token), {"data": {"status": "cancelled"}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.post_json('/tenders/{}/awards?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': {'suppliers': [test_organization], 'status': 'pending',
+                                                      'qualified': True, 'lotID': self.lot2['id']}})
+    self.assertEqual(response.status, '201 Created')
+    response = self.app.patch_json('/tenders/{}/awards/{}?acc_token={}'.format(
+        self.tender_id, response.json['data']['id'], self.tender_token), {"data": {"status": "active"}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    self.assertEqual(len(response.json['data']), 3)
+    self.assertEqual(response.json['data'][2]['contractID'], contract_ids[0][:-1] + '3')
+
+
+def check_tender_status_against_full_recalculation(self):
+    def assert_status_matches_full_recalculation():
+        tender = NegotiationTender(self.db.get(self.tender_id))
+        statuses = [tender.status] + [i.status for i in tender.lots]
+        check_tender_negotiation_status(type('Request', (object,), {'validated': {'tender': tender}}))
+        self.assertEqual([tender.status] + [i.status for i in tender.lots], statuses)
+
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    self.contract1_id = response.json['data'][0]['id']
+    self.contract2_id = response.json['data'][1]['id']
+
+    # time travel
+    tender = self.db.get(self.tender_id)
+    for i in tender.get('awards', []):
+        if i.get('complaintPeriod', {}):  # reporting procedure does not have complaintPeriod
+            i['complaintPeriod']['endDate'] = i['complaintPeriod']['startDate']
+    self.db.save(tender)
+
+    response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+        self.tender_id, self.contract2_id, self.tender_token), {"data": {"value": {"amount": 238}}})
+    self.assertEqual(response.status, '200 OK')
+    assert_status_matches_full_recalculation()
+
+    # lot is cancelled mid-flow
+    response = self.app.post_json('/tenders/{}/cancellations?acc_token={}'.format(self.tender_id, self.tender_token),
+                                  {'data': {'reason': 'cancellation reason', 'status': 'active',
+                                            'cancellationOf': 'lot', 'relatedLot': self.lot1['id']}})
+    self.assertEqual(response.status, '201 Created')
+    assert_status_matches_full_recalculation()
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['status'], 'active')
+    self.assertEqual([i['status'] for i in response.json['data']['lots']], ['cancelled', 'active'])
+
+    response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+        self.tender_id, self.contract2_id, self.tender_token), {"data": {"status": "active"}})
+    self.assertEqual(response.status, '200 OK')
+    assert_status_matches_full_recalculation()
+
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['status'], 'complete')
+    self.assertEqual([i['status'] for i in response.json['data']['lots']], ['cancelled', 'complete'])
+
+
+def patch_contract_updates_only_its_lot(self):
+    response = self.app.get('/tenders/{}/contracts'.format(self.tender_id))
+    contract1_id = response.json['data'][0]['id']
+    contract2_id = response.json['data'][1]['id']
+
+    # time travel, first contract is signed bypassing its status update
+    tender = self.db.get(self.tender_id)
+    for i in tender.get('awards', []):
+        if i.get('complaintPeriod', {}):  # reporting procedure does not have complaintPeriod
+            i['complaintPeriod']['endDate'] = i['complaintPeriod']['startDate']
+    for i in tender['contracts']:
+        if i['id'] == contract1_id:
+            i['status'] = 'active'
+    self.db.save(tender)
+
+    # the full check would complete the first lot here too
+    response = self.app.patch_json('/tenders/{}/contracts/{}?acc_token={}'.format(
+        self.tender_id, contract2_id, self.tender_token), {"data": {"value": {"amount": 238}}})
+    self.assertEqual(response.status, '200 OK')
+    response = self.app.get('/tenders/{}'.format(self.tender_id))
+    self.assertEqual(response.json['data']['status'], 'active')
+    self.assertEqual([i['status'] for i in response.json['data']['lots']], ['active', 'active'])
+
 # TenderNegotiationQuickAccelerationTest
 
 
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+from openprocurement.api.tests.base import snitch
 from openprocurement.tender.belowthreshold.tests.document import (
     TenderDocumentResourceTestMixin,
     TenderDocumentWithDSResourceTestMixin
@@ -12,12 +13,26 @@ from openprocurement.tender.limited.tests.base import (
     test_tender_negotiation_data,
     test_tender_negotiation_quick_data
 )
+from openprocurement.tender.limited.tests.document_blanks import (
+    # TenderDocumentResourceTest
+    get_tender_documents_page,
+    # TenderDocumentWithDSResourceTest
+    upload_hash_mismatch,
+    upload_cancellation_document_streamed,
+    # MultipartFileStreamTest
+    multipart_file_stream,
+    # DocumentIndexTest
+    document_index,
+    document_index_shared_by_revision,
+)
 
 
 class TenderDocumentResourceTest(BaseTenderContentWebTest, TenderDocumentResourceTestMixin):
     initial_data = test_tender_data
     docservice = False
 
+    test_get_tender_documents_page = snitch(get_tender_documents_page)
+
 
 class TenderNegotiationDocumentResourceTest(TenderDocumentResourceTest):
     initial_data = test_tender_negotiation_data
@@ -30,6 +45,9 @@ class TenderNegotiationQuickDocumentResourceTest(TenderNegotiationDocumentResour
 class TenderDocumentWithDSResourceTest(TenderDocumentResourceTest, TenderDocumentWithDSResourceTestMixin):
     docservice = True
 
+    test_upload_hash_mismatch = snitch(upload_hash_mismatch)
+    test_upload_cancellation_document_streamed = snitch(upload_cancellation_document_streamed)
+
 
 class TenderNegotiationDocumentWithDSResourceTest(TenderDocumentWithDSResourceTest):
     initial_data = test_tender_negotiation_data
@@ -39,10 +57,23 @@ class TenderNegotiationQuickDocumentWithDSResourceTest(TenderDocumentWithDSResou
     initial_data = test_tender_negotiation_quick_data
 
 
+class MultipartFileStreamTest(unittest.TestCase):
+
+    test_stream = snitch(multipart_file_stream)
+
+
+class DocumentIndexTest(unittest.TestCase):
+
+    test_index = snitch(document_index)
+    test_index_shared_by_revision = snitch(document_index_shared_by_revision)
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(TenderDocumentResourceTest))
     suite.addTest(unittest.makeSuite(TenderDocumentWithDSResourceTest))
+    suite.addTest(unittest.makeSuite(MultipartFileStreamTest))
+    suite.addTest(unittest.makeSuite(DocumentIndexTest))
     return suite
 
 
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from hashlib import md5
+from io import BytesIO
+
+from pyramid.request import Request
+from pyramid.threadlocal import manager
+
+from openprocurement.api import utils as api_utils
+from openprocurement.tender.limited.utils import (
+    MultipartFileStream, DocumentServiceSession, get_document_index, serialization_cache
+)
+
+# TenderDocumentResourceTest
+
+
+def get_tender_documents_page(self):
+    for i in range(3):
+        response = self.app.post('/tenders/{}/documents?acc_token={}'.format(self.tender_id, self.tender_token),
+                                 upload_files=[('file', 'name{}.doc'.format(i), 'content')])
+        self.assertEqual(response.status, '201 Created')
+
+    response = self.app.get('/tenders/{}/documents?limit=2'.format(self.tender_id))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual([i['title'] for i in response.json['data']], ['name0.doc', 'name1.doc'])
+    self.assertEqual(response.json['next_page']['offset'], 2)
+
+    response = self.app.get(response.json['next_page']['path'])
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual([i['title'] for i in response.json['data']], ['name2.doc'])
+    self.assertNotIn('next_page', response.json)
+
+    response = self.app.get('/tenders/{}/documents?limit=0'.format(self.tender_id), status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Invalid value', u'location': u'params', u'name': u'limit'}
+    ])
+
+# TenderDocumentWithDSResourceTest
+
+
+class DocumentServiceResponse(object):
+    status_code = 200
+    text = ''
+
+    def __init__(self, doc_hash):
+        self.doc_hash = doc_hash
+
+    def json(self):
+        return {'data': {'url': 'http://localhost/get/{}'.format('0' * 32), 'hash': self.doc_hash}}
+
+
+def upload_with_hashes(self, hashes, path='documents'):
+    """ Upload document with document service responding with given hashes to each attempt """
+    uploads = []
+
+    def request(method, url, data=None, **kwargs):
+        uploads.append(b''.join(data))
+        return DocumentServiceResponse(hashes[min(len(uploads), len(hashes)) - 1])
+
+    api_utils.SESSION.request = request
+    try:
+        response = self.app.post('/tenders/{}/{}?acc_token={}'.format(self.tender_id, path, self.tender_token),
+                                 upload_files=[('file', 'name.doc', 'content')], status='*')
+    finally:
+        del api_utils.SESSION.request
+    return response, uploads
+
+
+def upload_hash_mismatch(self):
+    self.assertIsInstance(api_utils.SESSION, DocumentServiceSession)
+    content_hash = 'md5:{}'.format(md5('content').hexdigest())
+    response, uploads = upload_with_hashes(self, ['md5:{}'.format('0' * 32), content_hash])
+    self.assertEqual(response.status, '201 Created')
+    self.assertEqual(response.json['data']['hash'], content_hash)
+    self.assertEqual(len(uploads), 2)
+    self.assertIn(b'content', uploads[1])
+
+    response, uploads = upload_with_hashes(self, ['md5:{}'.format('0' * 32)])
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': u"Can't upload document to document service.", u'location': u'body', u'name': u'data'}
+    ])
+    self.assertGreater(len(uploads), 1)
+
+
+def upload_cancellation_document_streamed(self):
+    response = self.app.post_json('/tenders/{}/cancellations?acc_token={}'.format(
+        self.tender_id, self.tender_token), {'data': {'reason': 'cancellation reason'}})
+    cancellation_id = response.json['data']['id']
+    content_hash = 'md5:{}'.format(md5('content').hexdigest())
+    response, uploads = upload_with_hashes(self, ['md5:{}'.format('0' * 32), content_hash],
+                                           'cancellations/{}/documents'.format(cancellation_id))
+    self.assertEqual(response.status, '201 Created')
+    self.assertEqual(response.json['data']['hash'], content_hash)
+    self.assertEqual(len(uploads), 2)
+
+# MultipartFileStreamTest
+
+
+def multipart_file_stream(self):
+    content = 'content' * 100000
+    body = MultipartFileStream(BytesIO(content), u'name.doc', 'application/msword')
+    chunks = list(body)
+    self.assertTrue(all([len(chunk) <= 64 * 1024 for chunk in chunks]))
+    data = ''.join(chunks)
+    self.assertEqual(len(data), len(body))
+    self.assertIn(content, data)
+    self.assertTrue(data.startswith('--{}\r\n'.format(body.boundary)))
+    self.assertTrue(data.endswith('\r\n--{}--\r\n'.format(body.boundary)))
+    self.assertEqual(body.size, len(content))
+    self.assertEqual(body.hash, 'md5:{}'.format(md5(content).hexdigest()))
+
+# DocumentIndexTest
+
+
+class Document(object):
+    def __init__(self, id, url):
+        self.id, self.url = id, url
+
+
+def document_index(self):
+    class Parent(object):
+        documents = [Document('a', 1), Document('b', 2), Document('a', 3)]
+
+    parent = Parent()
+    index = get_document_index(parent)
+    self.assertEqual([i.url for i in index.latest()], [2, 3])
+    self.assertEqual([i.url for i in index.versions('a')], [1, 3])
+
+    parent.documents.append(Document('b', 4))
+    self.assertIs(get_document_index(parent), index)
+    self.assertEqual([i.url for i in index.latest()], [3, 4])
+    self.assertEqual([i.url for i in index.versions('b')], [2, 4])
+
+
+def document_index_shared_by_revision(self):
+    class Tender(object):
+        id = 'tender_id'
+        rev = '1-a'
+
+        def __init__(self):
+            self.documents = [Document('a', 1), Document('b', 2), Document('a', 3)]
+
+    manager.push({'request': Request.blank('/'), 'registry': None})
+    try:
+        get_document_index(Tender())
+    finally:
+        manager.pop()
+    self.addCleanup(serialization_cache.clear)
+
+    tender = Tender()
+    tender.documents[0] = Document('a', 'reloaded')
+    index = get_document_index(tender)
+    self.assertEqual([i.url for i in index.versions('a')], ['reloaded', 3])
+
+    tender.documents.append(Document('b', 4))
+    index = get_document_index(tender)
+    self.assertEqual([i.url for i in index.latest()], [3, 4])
+    self.assertEqual([i.url for i in get_document_index(Tender()).versions('b')], [2])
+
+    Tender.rev = '2-b'
+    tender = Tender()
+    tender.documents[0] = Document('c', 5)
+    self.assertEqual([i.url for i in get_document_index(tender).latest()], [5, 2, 3])
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+""" In-memory stand-in for the CouchDB server and database used by the API.
+
+Documents are kept as JSON strings, so every read returns a fresh copy,
+and every save checks and bumps ``_rev`` like CouchDB does: saving a
+stale revision raises ``ResourceConflict``. Views of synced design
+documents are supported for the simple map functions openprocurement
+uses (filter by doc_type, status and mode, emit a field and a dict of
+listed fields); other views have no rows, with a warning logged once.
+"""
+import json
+import re
+from logging import getLogger
+from ast import literal_eval
+from base64 import b64decode
+from contextlib import contextmanager
+from hashlib import md5
+from io import BytesIO
+from threading import RLock
+from uuid import uuid4
+
+import couchdb
+from couchdb.client import Document, Row
+from couchdb.http import ResourceConflict, ResourceNotFound
+
+LOGGER = getLogger(__name__)
+MAP_EMIT = re.compile(r"emit\(doc\.(\w+),\s*(\w+)\)")
+MAP_DOC_TYPE = re.compile(r"doc\.doc_type\s*==\s*['\"](\w+)['\"]")
+MAP_FIELDS = re.compile(r"fields\s*=\s*(\[[^\]]*\])")
+MAP_CONDITIONS = {
+    "doc.status != 'draft'": lambda doc: doc.get('status') != 'draft',
+    "!doc.mode": lambda doc: not doc.get('mode'),
+    "doc.mode == 'test'": lambda doc: doc.get('mode') == 'test',
+}
+
+
+def compile_map(source):
+    """ Python version of simple map function, None if it isn't simple """
+    emit = MAP_EMIT.search(source)
+    if emit is None:
+        return None
+    key, value = emit.groups()
+    fields = MAP_FIELDS.search(source)
+    fields = literal_eval(fields.group(1)) if fields else []
+    doc_type = MAP_DOC_TYPE.search(source)
+    doc_type = doc_type.group(1) if doc_type else None
+    conditions = [condition for text, condition in MAP_CONDITIONS.items() if text in source]
+
+    def map_fun(doc):
+        if doc_type and doc.get('doc_type') != doc_type or not all([i(doc) for i in conditions]):
+            return []
+        data = dict([(i, doc[i]) for i in fields if doc.get(i)]) if value != 'null' else None
+        return [(doc.get(key), data)]
+    return map_fun
+
+
+class MemoryDatabase(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = {}
+        self.attachments = {}
+        self.local_seq = {}
+        self.seq = 0
+        self.unsupported_views = set()
+        self.lock = RLock()
+
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __iter__(self):
+        return iter(list(self.docs))
+
+    def __getitem__(self, doc_id):
+        doc = self.get(doc_id)
+        if doc is None:
+            raise ResourceNotFound(('not_found', 'missing'))
+        return doc
+
+    def __setitem__(self, doc_id, doc):
+        doc['_id'] = doc_id
+        self.save(doc)
+
+    def get(self, doc_id, default=None, **options):
+        data = self.docs.get(doc_id)
+        if data is None:
+            return default
+        return Document(json.loads(data))
+
+    def save(self, doc, **options):
+        with self.lock:
+            doc_id = doc.setdefault('_id', uuid4().hex)
+            data = self.docs.get(doc_id)
+            current = json.loads(data)['_rev'] if data is not None else None
+            if doc.get('_rev') != current:
+                raise ResourceConflict(('conflict', 'Document update conflict.'))
+            number = int(current.split('-', 1)[0]) if current else 0
+            doc['_rev'] = '{}-{}'.format(number + 1, uuid4().hex)
+            self.store_attachments(doc)
+            self.docs[doc_id] = json.dumps(doc)
+            self.seq += 1
+            self.local_seq[doc_id] = self.seq
+        return doc_id, doc['_rev']
+
+    def update(self, documents, **options):
+        results = []
+        for doc in documents:
+            try:
+                doc_id, rev = self.save(doc)
+            except ResourceConflict as e:
+                results.append((False, doc.get('_id'), e))
+            else:
+                results.append((True, doc_id, rev))
+        return results
+
+    def delete(self, doc):
+        with self.lock:
+            data = self.docs.get(doc['_id'])
+            if data is None:
+                raise ResourceNotFound(('not_found', 'missing'))
+            if json.loads(data)['_rev'] != doc.get('_rev'):
+                raise ResourceConflict(('conflict', 'Document update conflict.'))
+            del self.docs[doc['_id']]
+            self.attachments.pop(doc['_id'], None)
+            self.local_seq.pop(doc['_id'], None)
+
+    def store_attachments(self, doc):
+        """ Keep inline attachment data aside and leave stubs in document """
+        for filename, attachment in doc.get('_attachments', {}).items():
+            if 'data' in attachment:
+                content = b64decode(attachment.pop('data'))
+                self.attachments.setdefault(doc['_id'], {})[filename] = content
+                attachment.update({
+                    'stub': True,
+                    'length': len(content),
+                    'digest': 'md5-{}'.format(md5(content).hexdigest()),
+                })
+
+    def put_attachment(self, doc, content, filename=None, content_type=None):
+        if hasattr(content, 'read'):
+            filename = filename or getattr(content, 'name', None)
+            content = content.read()
+        with self.lock:
+            stored = self[doc['_id']]
+            if stored['_rev'] != doc.get('_rev'):
+                raise ResourceConflict(('conflict', 'Document update conflict.'))
+            stored.setdefault('_attachments', {})[filename] = {
+                'content_type': content_type,
+                'stub': True,
+                'length': len(content),
+                'digest': 'md5-{}'.format(md5(content).hexdigest()),
+            }
+            self.attachments.setdefault(doc['_id'], {})[filename] = content
+            self.save(stored)
+            doc['_rev'] = stored['_rev']
+
+    def get_attachment(self, id_or_doc, filename, default=None):
+        doc_id = id_or_doc if isinstance(id_or_doc, basestring) else id_or_doc['_id']
+        content = self.attachments.get(doc_id, {}).get(filename)
+        if content is None:
+            return default
+        return BytesIO(content)
+
+    def view(self, name, wrapper=None, **options):
+        design, view = name.split('/', 1)
+        source = self.get('_design/{}'.format(design), {}).get('views', {}).get(view, {}).get('map', '')
+        map_fun = compile_map(source)
+        if map_fun is None:
+            if name not in self.unsupported_views:
+                self.unsupported_views.add(name)
+                LOGGER.warning('View is not supported by in-memory database, no rows returned: %s', name)
+            return []
+        descending = options.get('descending', False)
+        rows = []
+        for doc_id, data in self.docs.items():
+            if doc_id.startswith('_design/'):
+                continue
+            doc = json.loads(data)
+            doc['_local_seq'] = self.local_seq[doc_id]
+            for key, value in map_fun(doc):
+                if 'key' in options and key != options['key']:
+                    continue
+                if options.get('startkey') is not None and (key > options['startkey'] if descending else key < options['startkey']):
+                    continue
+                if options.get('endkey') is not None and (key < options['endkey'] if descending else key > options['endkey']):
+                    continue
+                row = Row({'id': doc_id, 'key': key, 'value': value})
+                if options.get('include_docs'):
+                    del doc['_local_seq']
+                    row['doc'] = doc
+                rows.append(row)
+        rows.sort(key=lambda row: (row['key'], row['id']), reverse=descending)
+        rows = rows[options.get('skip', 0):]
+        if options.get('limit') is not None:
+            rows = rows[:options['limit']]
+        return [wrapper(row) for row in rows] if wrapper else rows
+
+
+class MemoryServer(object):
+
+    def __init__(self, url=None, **kwargs):
+        self.url = url
+        self.databases = {}
+        self.resource = type('Resource', (object,), {'credentials': None})()
+
+    def __contains__(self, name):
+        return name in self.databases
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            raise ResourceNotFound(('not_found', 'no_db_file'))
+        return self.databases[name]
+
+    def __iter__(self):
+        return iter(list(self.databases))
+
+    def create(self, name):
+        if name in self.databases:
+            raise couchdb.http.PreconditionFailed(('file_exists', 'The database could not be created.'))
+        self.databases[name] = MemoryDatabase(name)
+        return self.databases[name]
+
+    def delete(self, name):
+        if name not in self.databases:
+            raise ResourceNotFound(('not_found', 'missing'))
+        del self.databases[name]
+
+    __delitem__ = delete
+
+    def version(self):
+        return 'memory'
+
+
+@contextmanager
+def memory_couchdb():
+    """ Make the API application created in this block use MemoryServer """
+    from openprocurement.api import app
+    names = [name for name, value in vars(app).items() if value is couchdb.Server]
+    for name in names:
+        setattr(app, name, MemoryServer)
+    try:
+        yield
+    finally:
+        for name in names:
+            setattr(app, name, couchdb.Server)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from base64 import b64encode
+from threading import Thread
+from time import sleep
+
+from couchdb.http import ResourceConflict
+
+from openprocurement.tender.limited.locks import TenderLocks, LockTimeout, LOCK_FILES, tender_locks_tween_factory
+from openprocurement.tender.limited.utils import SerializationCache, get_cached_serialization
+from openprocurement.tender.limited.tests.memorydb import MemoryServer
+
+
+class MemoryDatabaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MemoryServer()
+        self.db = self.server.create('test')
+
+    def tearDown(self):
+        del self.server['test']
+
+    def test_revisions(self):
+        doc = {'_id': 'tender', 'status': 'active'}
+        doc_id, rev = self.db.save(doc)
+        self.assertEqual(doc_id, 'tender')
+        self.assertEqual(doc['_rev'], rev)
+        self.assertTrue(rev.startswith('1-'))
+
+        fresh = self.db.get('tender')
+        fresh['status'] = 'complete'
+        self.db.save(fresh)
+        self.assertTrue(fresh['_rev'].startswith('2-'))
+
+        doc['status'] = 'cancelled'
+        with self.assertRaises(ResourceConflict):
+            self.db.save(doc)
+        self.assertEqual(self.db['tender']['status'], 'complete')
+        with self.assertRaises(ResourceConflict):
+            self.db.save({'_id': 'tender'})
+
+    def test_reads_are_copies(self):
+        self.db.save({'_id': 'tender', 'items': [{'id': 'item'}]})
+        doc = self.db.get('tender')
+        doc['items'].append({'id': 'other'})
+        self.assertEqual(len(self.db.get('tender')['items']), 1)
+        self.assertIsNone(self.db.get('missing'))
+
+    def test_attachments(self):
+        doc = {'_id': 'tender', '_attachments': {'file': {'content_type': 'text/plain', 'data': b64encode('content')}}}
+        self.db.save(doc)
+        stub = self.db['tender']['_attachments']['file']
+        self.assertEqual(stub['length'], 7)
+        self.assertTrue(stub['stub'])
+        self.assertEqual(self.db.get_attachment('tender', 'file').read(), 'content')
+
+    def test_view(self):
+        self.db.update([{'_id': '_design/tenders', 'views': {'by_dateModified': {'map': '''function(doc) {
+            if(doc.doc_type == 'Tender' && doc.status != 'draft' && !doc.mode) {
+                var fields=['status'], data={};
+                for (var i in fields) { if (doc[fields[i]]) { data[fields[i]] = doc[fields[i]] } }
+                emit(doc.dateModified, data);
+            }
+        }'''}}}])
+        self.db.save({'_id': 'a', 'doc_type': 'Tender', 'status': 'active', 'dateModified': '2'})
+        self.db.save({'_id': 'b', 'doc_type': 'Tender', 'status': 'active', 'dateModified': '1'})
+        self.db.save({'_id': 'c', 'doc_type': 'Tender', 'status': 'draft', 'dateModified': '3'})
+        self.db.save({'_id': 'd', 'doc_type': 'Tender', 'status': 'active', 'dateModified': '4', 'mode': 'test'})
+
+        rows = self.db.view('tenders/by_dateModified')
+        self.assertEqual([(i.id, i.key, i.value) for i in rows], [('b', '1', {'status': 'active'}), ('a', '2', {'status': 'active'})])
+        rows = self.db.view('tenders/by_dateModified', descending=True, limit=1, include_docs=True)
+        self.assertEqual([i['doc']['_id'] for i in rows], ['a'])
+        rows = self.db.view('tenders/by_dateModified', startkey='2')
+        self.assertEqual([i.id for i in rows], ['a'])
+
+    def test_unsupported_view(self):
+        self.db.update([{'_id': '_design/tenders', 'views': {'by_lots': {'map': '''function(doc) {
+            for (var i in doc.lots) { emit(doc.lots[i].id, null) }
+        }'''}}}])
+        self.db.save({'_id': 'a', 'doc_type': 'Tender', 'lots': [{'id': 'lot'}]})
+        self.assertEqual(self.db.view('tenders/by_lots'), [])
+        self.assertEqual(self.db.view('tenders/missing'), [])
+        self.assertEqual(self.db.unsupported_views, {'tenders/by_lots', 'tenders/missing'})
+
+
+class TenderLocksTest(unittest.TestCase):
+    lock_dir = None
+    lock_files = LOCK_FILES
+
+    def run_writers(self, tender_ids, workers=1):
+        locks = [TenderLocks(self.lock_dir, self.lock_files) for i in range(workers)]
+        events = []
+
+        def write(tender_id, worker):
+            with worker(tender_id):
+                events.append(('start', tender_id))
+                sleep(0.05)
+                events.append(('end', tender_id))
+
+        threads = [Thread(target=write, args=(tender_id, locks[i % workers])) for i, tender_id in enumerate(tender_ids)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([i.locks for i in locks], [{}] * workers)
+        return [i[0] for i in events]
+
+    def test_same_tender_serialized(self):
+        self.assertEqual(self.run_writers(['a' * 32] * 3), ['start', 'end'] * 3)
+
+    def test_different_tenders_parallel(self):
+        self.assertEqual(self.run_writers(['a' * 32, 'b' * 32]), ['start', 'start', 'end', 'end'])
+
+    def test_timeout(self):
+        locks = TenderLocks(self.lock_dir, self.lock_files, timeout=0.05)
+        other = TenderLocks(self.lock_dir, self.lock_files, timeout=0.05)
+        with locks('a' * 32):
+            with self.assertRaises(LockTimeout):
+                with locks('a' * 32):
+                    pass
+            if self.lock_dir:
+                with self.assertRaises(LockTimeout):
+                    with other('a' * 32):
+                        pass
+        self.assertEqual(locks.locks, {})
+        with locks('a' * 32):
+            pass
+
+
+class TenderLocksTweenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MemoryServer()
+        self.db = self.server.create('test')
+        self.db.save({'_id': 'a' * 32, 'procurementMethodType': 'reporting'})
+        self.db.save({'_id': 'b' * 32, 'procurementMethodType': 'belowThreshold'})
+        self.registry = type('Registry', (object,), {'db': self.db})()
+        self.registry.limited_tender_locks = TenderLocks(timeout=0.05)
+        self.locked = []
+
+    def handler(self, request):
+        self.locked.append(bool(self.registry.limited_tender_locks.locks))
+        return 'response'
+
+    def request(self, method, tender_id):
+        return type('Request', (object,), {'method': method, 'registry': self.registry,
+                                           'path_info': '/api/2.4/tenders/{}/awards'.format(tender_id)})()
+
+    def test_limited_tenders_locked(self):
+        tween = tender_locks_tween_factory(self.handler, self.registry)
+        self.assertEqual(tween(self.request('PATCH', 'a' * 32)), 'response')
+        self.assertEqual(tween(self.request('GET', 'a' * 32)), 'response')
+        self.assertEqual(tween(self.request('PATCH', 'b' * 32)), 'response')
+        self.assertEqual(self.locked, [True, False, False])
+
+    def test_lock_timeout(self):
+        tween = tender_locks_tween_factory(self.handler, self.registry)
+        with self.registry.limited_tender_locks('a' * 32):
+            response = tween(self.request('POST', 'a' * 32))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json_body['status'], 'error')
+        self.assertEqual(self.locked, [])
+
+
+class TenderLockFilesTest(TenderLocksTest):
+
+    def setUp(self):
+        self.lock_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.lock_dir)
+
+    def test_same_tender_serialized_across_workers(self):
+        self.assertEqual(self.run_writers(['a' * 32] * 3, workers=3), ['start', 'end'] * 3)
+
+    def test_lock_files_bounded(self):
+        self.lock_files = 4
+        self.run_writers(['{:032x}'.format(i) for i in range(20)])
+        self.assertLessEqual(len(os.listdir(self.lock_dir)), 4)
+
+    def test_shared_lock_file_serialized_across_workers(self):
+        self.lock_files = 1
+        self.assertEqual(self.run_writers(['a' * 32, 'b' * 32], workers=2), ['start', 'end'] * 2)
+
+
+class SerializationCacheTest(unittest.TestCase):
+
+    def tender(self, tender_id, rev='1-a'):
+        return type('Tender', (object,), {'id': tender_id, 'rev': rev})()
+
+    def test_entries_bounded(self):
+        cache = SerializationCache(10, 3)
+        for i in range(5):
+            cache.set(self.tender('a'), ('awards', 'fields:{}'.format(i)), i)
+        self.assertEqual(cache.entries, 3)
+        self.assertIsNone(cache.get(self.tender('a'), ('awards', 'fields:0')))
+        self.assertEqual(cache.get(self.tender('a'), ('awards', 'fields:4')), 4)
+
+        cache.set(self.tender('b'), ('awards', 'view'), 'b')
+        cache.set(self.tender('b'), ('lots', 'view'), 'b')
+        self.assertEqual(cache.entries, 2)
+        self.assertIsNone(cache.get(self.tender('a'), ('awards', 'fields:4')))
+
+    def test_tenders_bounded(self):
+        cache = SerializationCache(2, 10)
+        for tender_id in 'abc':
+            cache.set(self.tender(tender_id), ('awards', 'view'), tender_id)
+        self.assertIsNone(cache.get(self.tender('a'), ('awards', 'view')))
+        self.assertEqual(cache.get(self.tender('c'), ('awards', 'view')), 'c')
+        self.assertEqual(cache.entries, 2)
+
+    def test_cached_copies(self):
+        registry = type('Registry', (object,), {'docservice_url': None})()
+        request = type('Request', (object,), {'validated': {'tender': self.tender('copies')},
+                                              'host_url': 'http://localhost', 'registry': registry})()
+        calls = []
+        serialize = lambda: calls.append(1) or [{'id': 'a'}]
+
+        data = get_cached_serialization(request, 'awards', 'view', serialize)
+        data[0]['id'] = 'changed'
+        self.assertEqual(get_cached_serialization(request, 'awards', 'view', serialize), [{'id': 'a'}])
+        self.assertEqual(len(calls), 1)
+
+        registry.docservice_url = 'http://localhost'
+        get_cached_serialization(request, 'documents', 'view', serialize, documents=True)
+        get_cached_serialization(request, 'documents', 'view', serialize, documents=True)
+        self.assertEqual(len(calls), 3)
+
+    def test_stale_revision(self):
+        cache = SerializationCache(2, 10)
+        cache.set(self.tender('a'), ('awards', 'view'), 'a')
+        self.assertIsNone(cache.get(self.tender('a', '2-b'), ('awards', 'view')))
+        self.assertEqual(cache.entries, 0)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(MemoryDatabaseTest))
+    suite.addTest(unittest.makeSuite(SerializationCacheTest))
+    suite.addTest(unittest.makeSuite(TenderLocksTest))
+    suite.addTest(unittest.makeSuite(TenderLockFilesTest))
+    suite.addTest(unittest.makeSuite(TenderLocksTweenTest))
+    return suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -43,13 +43,18 @@ from openprocurement.tender.limited.tests.tender_blanks import (
     create_tender_generated,
     create_tender,
     patch_tender,
+    patch_tender_timings,
     tender_Administrator_change,
     # TenderNegotiationQuickTest
     simple_add_tender_negotiation_quick,
     # TenderNegotiationTest
     simple_add_tender_negotiation,
+    tender_lazy_hydration,
+    tender_raw_serialization,
+    tender_compact_lists,
     # TenderTest
     simple_add_tender,
+    item_value_follows_owner,
     # AccreditationTenderTest
     create_tender_accreditation,
 )
@@ -70,12 +75,16 @@ class TenderTest(BaseTenderWebTest):
     initial_data = test_tender_data
 
     test_simple_add_tender = snitch(simple_add_tender)
+    test_item_value_follows_owner = snitch(item_value_follows_owner)
 
 
 class TenderNegotiationTest(BaseTenderWebTest):
     initial_data = test_tender_negotiation_data
 
     test_simple_add_tender = snitch(simple_add_tender_negotiation)
+    test_tender_lazy_hydration = snitch(tender_lazy_hydration)
+    test_tender_raw_serialization = snitch(tender_raw_serialization)
+    test_tender_compact_lists = snitch(tender_compact_lists)
 
 
 class TenderNegotiationQuickTest(TenderNegotiationTest):
@@ -99,6 +108,7 @@ class TenderResourceTest(BaseTenderWebTest):
     test_create_tender = snitch(create_tender)
     test_get_tender = snitch(get_tender)
     test_patch_tender = snitch(patch_tender)
+    test_patch_tender_timings = snitch(patch_tender_timings)
     test_dateModified_tender = snitch(dateModified_tender)
     test_tender_not_found = snitch(tender_not_found)
     test_tender_Administrator_change = snitch(tender_Administrator_change)
@@ -14,8 +14,13 @@ from openprocurement.tender.belowthreshold.tests.base import test_organization
 from openprocurement.tender.limited.models import (
     NegotiationTender,
     NegotiationQuickTender,
-    ReportingTender
+    ReportingTender,
+    LazyListsModel
 )
+from openprocurement.tender.limited.compact import CompactList
+from openprocurement.tender.limited.serializers import get_serializer
+from openprocurement.tender.limited.tests.base import test_lots
+from openprocurement.tender.limited.timing import timings
 
 # AccreditationTenderTest
 
@@ -66,6 +71,20 @@ def simple_add_tender(self):
 
     u.delete_instance(self.db)
 
+
+def item_value_follows_owner(self):
+    data = deepcopy(self.initial_data)
+    data['items'][0]['unit'] = dict(data['items'][0].get('unit', {}), value={'amount': 10})
+    tender = ReportingTender(data)
+    item = tender.items[0]
+    self.assertEqual(item.serialize()['unit']['value']['currency'], tender.value.currency)
+
+    contract = ReportingTender._fields['contracts'].field.model_class(
+        {'id': uuid4().hex, 'awardID': uuid4().hex, 'value': {'amount': 100, 'currency': 'USD'}})
+    contract.__parent__ = tender
+    item.__parent__ = contract
+    self.assertEqual(item.serialize()['unit']['value']['currency'], 'USD')
+
 # TenderNegotiationTest
 
 
@@ -90,6 +109,81 @@ def simple_add_tender_negotiation(self):
 
     u.delete_instance(self.db)
 
+
+def tender_lazy_hydration(self):
+    data = deepcopy(self.initial_data)
+    lot_id = uuid4().hex
+    data['lots'] = [dict(deepcopy(test_lots[0]), id=lot_id)]
+    data['awards'] = [{'id': uuid4().hex, 'lotID': lot_id, 'status': 'pending', 'suppliers': [test_organization],
+                       'complaints': [{'id': uuid4().hex, 'title': 'complaint title', 'author': test_organization}]}]
+    eager = NegotiationTender(data)
+
+    LazyListsModel.lazy_hydration = True
+    try:
+        tender = NegotiationTender(data)
+    finally:
+        LazyListsModel.lazy_hydration = False
+    self.assertEqual(sorted(tender._lazy_data), ['awards', 'lots'])
+
+    award = tender.awards[0]
+    self.assertEqual(sorted(tender._lazy_data), ['lots'])
+    self.assertIs(award.__parent__, tender)
+    self.assertEqual(award.lotID, lot_id)
+    self.assertEqual(sorted(award._lazy_data), ['complaints'])
+    self.assertEqual(award.complaints[0].title, 'complaint title')
+
+    self.assertEqual(tender.serialize('view'), eager.serialize('view'))
+    self.assertEqual(tender._lazy_data, {})
+
+
+def tender_compact_lists(self):
+    data = deepcopy(self.initial_data)
+    lot_id = uuid4().hex
+    data['lots'] = [dict(deepcopy(test_lots[0]), id=lot_id)]
+    data['awards'] = [{'id': uuid4().hex, 'lotID': lot_id, 'status': 'pending', 'suppliers': [test_organization],
+                       'complaints': [{'id': uuid4().hex, 'title': 'complaint title', 'author': test_organization}]}]
+    data = NegotiationTender(data).to_primitive()
+    eager = NegotiationTender(data)
+
+    LazyListsModel.lazy_hydration = LazyListsModel.compact_lists = True
+    try:
+        tender = NegotiationTender(data)
+        self.assertIsInstance(tender.raw_list('awards'), CompactList)
+        self.assertEqual(list(tender.raw_list('awards')), data['awards'])
+        self.assertEqual(tender.raw_list('lots')[:1], data['lots'])
+
+        award = tender.awards[0]
+        self.assertIsInstance(award.raw_list('complaints'), CompactList)
+        self.assertEqual(award.complaints[0].title, 'complaint title')
+    finally:
+        LazyListsModel.lazy_hydration = LazyListsModel.compact_lists = False
+    self.assertEqual(tender.serialize('view'), eager.serialize('view'))
+
+
+def tender_raw_serialization(self):
+    data = deepcopy(self.initial_data)
+    lot_id = uuid4().hex
+    award_id = uuid4().hex
+    data['lots'] = [dict(deepcopy(test_lots[0]), id=lot_id), dict(deepcopy(test_lots[0]), id=uuid4().hex)]
+    data['awards'] = [{'id': award_id, 'lotID': lot_id, 'status': 'active', 'suppliers': [test_organization],
+                       'value': data['value'], 'date': get_now().isoformat()}]
+    data = NegotiationTender(data).to_primitive()
+    eager = NegotiationTender(data)
+
+    LazyListsModel.lazy_hydration = True
+    try:
+        tender = NegotiationTender(data)
+        serialize = get_serializer(NegotiationTender._fields['lots'].field.model_class, 'view')
+        self.assertIsNotNone(serialize)
+        self.assertEqual([serialize(i, ((NegotiationTender, tender),)) for i in tender.raw_list('lots')],
+                         [i.serialize('view') for i in eager.lots])
+    finally:
+        LazyListsModel.lazy_hydration = False
+
+    # documents url is computed from request and document service, these fall back to models
+    for name, role in [('awards', 'view'), ('contracts', None), ('cancellations', 'view')]:
+        self.assertIsNone(get_serializer(NegotiationTender._fields[name].field.model_class, role))
+
 # TenderNegotiationQuickTest
 
 
@@ -771,6 +865,44 @@ def patch_tender(self):
     self.assertEqual(response.json['errors'][0]["description"], "Can't update tender in current (complete) status")
 
 
+def patch_tender_timings(self):
+    response = self.app.post_json('/tenders', {'data': self.initial_data})
+    self.assertEqual(response.status, '201 Created')
+    tender = response.json['data']
+    owner_token = response.json['access']['token']
+
+    timings.reset()
+    timings.enabled = True
+    try:
+        response = self.app.patch_json('/tenders/{}?acc_token={}'.format(
+            tender['id'], owner_token), {'data': {'procurementMethodRationale': 'Limited'}})
+        self.assertEqual(response.status, '200 OK')
+    finally:
+        timings.enabled = False
+    dump = timings.dump()
+    self.assertEqual(dump['validate_patch_tender_data']['count'], 1)
+    self.assertEqual(dump['apply_patch']['count'], 1)
+    self.assertEqual(sum(dump['apply_patch']['buckets'].values()), 1)
+    self.assertEqual(dump['apply_patch_save_tender']['count'], 1)
+    self.assertNotIn('save_tender', dump)
+
+    response = self.app.get('/limited/timings', status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+
+    authorization = self.app.authorization
+    self.app.authorization = ('Basic', ('administrator', ''))
+    response = self.app.get('/limited/timings')
+    self.app.authorization = authorization
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'], dump)
+
+    timings.reset()
+    response = self.app.patch_json('/tenders/{}?acc_token={}'.format(
+        tender['id'], owner_token), {'data': {'procurementMethodRationale': 'Open'}})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(timings.dump(), {})
+
+
 def tender_Administrator_change(self):
     response = self.app.post_json('/tenders', {'data': self.initial_data})
     self.assertEqual(response.status, '201 Created')
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+""" Timing of request validators, apply_patch and save_tender.
+
+Views of limited procedures use json_view, apply_patch and save_tender
+from this module. When timing is enabled (``limited.timing = true`` in
+application settings) each call is timed: durations of a request are
+logged as one record with ``TIMING_<NAME>`` fields (milliseconds) and
+are aggregated into per-name histograms available by ``timings.dump()``
+and, for administrators, at ``/limited/timings``. Saving of the tender
+by apply_patch is timed on its own as ``apply_patch_save_tender``, so
+``apply_patch`` covers only applying the patch to the context.
+Disabled timing costs one flag check per call.
+"""
+from bisect import bisect_left
+from functools import wraps
+from logging import getLogger
+from threading import Lock
+from time import time
+
+from openprocurement.api.utils import json_view as base_json_view, context_unpack
+from openprocurement.tender.core.utils import (
+    apply_data_patch, save_tender as base_save_tender
+)
+
+LOGGER = getLogger('openprocurement.tender.limited')
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)  # seconds
+
+
+class Timings(object):
+    """ Per-name histograms of call durations """
+
+    def __init__(self, buckets=BUCKETS):
+        self.enabled = False
+        self.buckets = buckets
+        self.histograms = {}
+        self.lock = Lock()
+
+    def add(self, request, name, duration):
+        request_timings = getattr(request, 'limited_timings', None)
+        if request_timings is None:
+            request_timings = request.limited_timings = []
+            request.add_response_callback(log_timings)
+        request_timings.append((name, duration))
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = {'count': 0, 'sum': 0.0, 'buckets': [0] * (len(self.buckets) + 1)}
+            histogram['count'] += 1
+            histogram['sum'] += duration
+            histogram['buckets'][bisect_left(self.buckets, duration)] += 1
+
+    def dump(self):
+        """ Histograms as {name: {count, sum, buckets: {upper bound: count}}} """
+        bounds = [str(i) for i in self.buckets] + ['+Inf']
+        with self.lock:
+            return dict([
+                (name, {
+                    'count': histogram['count'],
+                    'sum': histogram['sum'],
+                    'buckets': dict(zip(bounds, histogram['buckets'])),
+                })
+                for name, histogram in self.histograms.items()
+            ])
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+timings = Timings()
+
+
+def log_timings(request, response):
+    params = {}
+    for name, duration in request.limited_timings:
+        key = 'TIMING_{}'.format(name.upper())
+        params[key] = params.get(key, 0) + round(duration * 1000, 3)
+    LOGGER.info('Request timings', extra=context_unpack(request, {'MESSAGE_ID': 'limited_timings'}, params))
+
+
+def timed(name, func):
+    """ Time calls of func(request, ...) under given name """
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        if not timings.enabled:
+            return func(request, *args, **kwargs)
+        start = time()
+        try:
+            return func(request, *args, **kwargs)
+        finally:
+            timings.add(request, name, time() - start)
+    return wrapper
+
+
+def json_view(**kwargs):
+    """ api json_view with timed validators """
+    if kwargs.get('validators'):
+        kwargs['validators'] = tuple([
+            timed(validator.__name__, validator) if callable(validator) else validator
+            for validator in kwargs['validators']
+        ])
+    return base_json_view(**kwargs)
+
+
+def patch_context(request, data=None, src=None):
+    """ Apply data patch to request context, the patch applied is returned """
+    data = request.validated['data'] if data is None else data
+    patch = data and apply_data_patch(src or request.context.serialize(), data)
+    if patch:
+        request.context.import_data(patch)
+    return patch
+
+
+patch_context = timed('apply_patch', patch_context)
+save_patched_tender = timed('apply_patch_save_tender', base_save_tender)
+save_tender = timed('save_tender', base_save_tender)
+
+
+def apply_patch(request, data=None, save=True, src=None):
+    """ core apply_patch with patching and saving timed separately """
+    if patch_context(request, data, src) and save:
+        return save_patched_tender(request)
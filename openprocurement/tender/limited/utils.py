@@ -0,0 +1,584 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from functools import wraps
+from hashlib import md5
+from io import BytesIO
+from json import dumps, loads
+from logging import getLogger
+from threading import Lock
+from urllib import urlencode
+from uuid import uuid4
+from pyramid.httpexceptions import HTTPNotModified
+from pyramid.threadlocal import get_current_request
+from requests import Session
+from schematics.transforms import whitelist, to_primitive
+from schematics.types.compound import ModelType, ListType
+from openprocurement.api.utils import error_handler, context_unpack
+from openprocurement.tender.core.utils import extract_tender_adapter
+from openprocurement.tender.limited.locks import LIMITED_TYPES
+from openprocurement.tender.limited.serializers import get_serializer
+from openprocurement.tender.limited.timing import save_tender
+
+LOGGER = getLogger('openprocurement.tender.limited')
+SERIALIZATION_CACHE_SIZE = 512  # number of tenders
+SERIALIZATION_CACHE_ENTRIES = 4096  # number of serialized sub-objects of all tenders
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_PROJECTIONS = 1000
+UPLOAD_CHUNK_SIZE = 64 * 1024
+REBASE_ATTEMPTS = 3
+
+
+class SerializationCache(object):
+    """ LRU cache of serialized tender sub-objects.
+
+    Entries are grouped by tender and bound to the tender revision they
+    were rendered from, so any save of the tender (new ``_rev``) makes them
+    stale and they are dropped on the next lookup. Both the number of
+    tenders and the total number of entries are bounded, least recently
+    used tenders (and entries of a single tender) are evicted first.
+    """
+
+    def __init__(self, maxsize, maxentries):
+        self.maxsize = maxsize
+        self.maxentries = maxentries
+        self.entries = 0
+        self.tenders = OrderedDict()
+        self.lock = Lock()
+
+    def pop(self, tender):
+        entry = self.tenders.pop(tender.id, None)
+        if entry is not None:
+            self.entries -= len(entry[1])
+        return entry
+
+    def get(self, tender, key):
+        with self.lock:
+            entry = self.pop(tender)
+            if entry is None or entry[0] != tender.rev:
+                return
+            self.tenders[tender.id] = entry
+            self.entries += len(entry[1])
+            return entry[1].get(key)
+
+    def set(self, tender, key, value):
+        with self.lock:
+            entry = self.pop(tender)
+            if entry is None or entry[0] != tender.rev:
+                entry = (tender.rev, OrderedDict())
+            entry[1].pop(key, None)
+            entry[1][key] = value
+            while len(entry[1]) > self.maxentries:
+                entry[1].popitem(last=False)
+            self.tenders[tender.id] = entry
+            self.entries += len(entry[1])
+            while len(self.tenders) > self.maxsize or self.entries > self.maxentries:
+                self.entries -= len(self.tenders.popitem(last=False)[1][1])
+
+    def clear(self):
+        with self.lock:
+            self.tenders.clear()
+            self.entries = 0
+
+
+serialization_cache = SerializationCache(SERIALIZATION_CACHE_SIZE, SERIALIZATION_CACHE_ENTRIES)
+projections = {}
+projections_lock = Lock()
+models_with_documents = {}
+
+
+def has_documents(model_class):
+    """ Whether serialized model data may include documents """
+    if model_class not in models_with_documents:
+        fields = [i.field if isinstance(i, ListType) else i for i in model_class._fields.values()]
+        models_with_documents[model_class] = 'documents' in model_class._fields or any([
+            has_documents(i.model_class) for i in fields if isinstance(i, ModelType)
+        ])
+    return models_with_documents[model_class]
+
+
+def get_cached_serialization(request, path, role, serialize, documents=False):
+    """ Return serialize() result for tender sub-object (collection) at path
+        in given role, reusing the result rendered for the same tender revision.
+
+        Results are kept JSON encoded, so every request gets its own copy.
+        Document urls are generated for the request when the document
+        service is used, so results with ``documents`` are not cached then.
+    """
+    tender = request.validated['tender']
+    if not tender.rev or documents and request.registry.docservice_url:
+        return serialize()
+    key = (path, role, request.host_url)
+    data = serialization_cache.get(tender, key)
+    if data is None:
+        data = dumps(serialize())
+        serialization_cache.set(tender, key, data)
+    return loads(data)
+
+
+class DocumentIndex(object):
+    """ Positions of document versions in documents list grouped by document id.
+
+    Documents are ordered by their latest version, which is the order of
+    dateModified as new versions are only appended. Documents appended
+    to the list after the index was built are added on next lookup.
+    Positions are kept in tuples, so indexes built from the same tender
+    revision can share them.
+    """
+
+    def __init__(self, documents, size=0, positions=None):
+        self.documents = documents
+        self.size = size
+        self.positions = OrderedDict(positions or ())
+        self.update()
+
+    def update(self):
+        for position in range(self.size, len(self.documents)):
+            document_id = self.documents[position].id
+            self.positions[document_id] = self.positions.pop(document_id, ()) + (position,)
+        self.size = len(self.documents)
+
+    def versions(self, document_id):
+        return [self.documents[i] for i in self.positions.get(document_id, ())]
+
+    def latest(self):
+        return [self.documents[i[-1]] for i in self.positions.values()]
+
+
+def get_document_index(parent):
+    """ Document index of tender (award, contract, cancellation) documents.
+
+        The index is kept with the parent for the request and shared by
+        requests of the same tender revision through the serialization
+        cache. Only reads store it there, as writes may add documents to
+        the revision they loaded.
+    """
+    documents = parent.documents
+    index = getattr(parent, '_document_index', None)
+    if index is not None and index.documents is documents and index.size <= len(documents):
+        index.update()
+        return index
+    root = parent
+    while getattr(root, '__parent__', None) is not None:
+        root = root.__parent__
+    key = ('document_index', type(parent).__name__, getattr(parent, 'id', None))
+    cached = serialization_cache.get(root, key) if getattr(root, 'rev', None) else None
+    if cached is not None and cached[0] <= len(documents):
+        index = DocumentIndex(documents, *cached)
+    else:
+        index = DocumentIndex(documents)
+        request = get_current_request()
+        if getattr(root, 'rev', None) and getattr(request, 'method', None) == 'GET':
+            serialization_cache.set(root, key, (index.size, index.positions.items()))
+    parent._document_index = index
+    return index
+
+
+def serialize_documents(parent, all_versions=False):
+    """ Serialize documents list, only the latest version of each document
+        unless all versions are requested.
+    """
+    if all_versions:
+        return [i.serialize("view") for i in parent.documents]
+    return [i.serialize("view") for i in get_document_index(parent).latest()]
+
+
+def get_previous_versions(parent, document):
+    """ Serialized previous versions of the document """
+    return [
+        i.serialize("view")
+        for i in get_document_index(parent).versions(document.id)
+        if i.url != document.url
+    ]
+
+
+def get_pagination(request):
+    """ (offset, limit) of requested collection page,
+        None if neither ``offset`` nor ``limit`` is given
+    """
+    if 'offset' not in request.params and 'limit' not in request.params:
+        return
+    pagination = []
+    for name, default, minimum in [('offset', 0, 0), ('limit', PAGE_SIZE, 1)]:
+        try:
+            value = int(request.params.get(name, default))
+        except ValueError:
+            value = None
+        if value is None or value < minimum:
+            request.errors.add('params', name, 'Invalid value')
+            request.errors.status = 422
+            raise error_handler(request.errors)
+        pagination.append(value)
+    offset, limit = pagination
+    return offset, min(limit, MAX_PAGE_SIZE)
+
+
+def paginate(request, items, serialize, pagination):
+    """ Collection page response, with ``next_page`` link if there are more items """
+    offset, limit = pagination
+    data = {'data': [serialize(i) for i in items[offset:offset + limit]]}
+    if offset + limit < len(items):
+        params = dict(request.params)
+        params.update({'offset': offset + limit, 'limit': limit})
+        path = '{}?{}'.format(request.path, urlencode(sorted(params.items())))
+        data['next_page'] = {
+            'offset': offset + limit,
+            'path': path,
+            'uri': request.application_url + path
+        }
+    return data
+
+
+def get_projection(model_class, fields, role='view'):
+    """ Model class serializing only given fields of the model in ``role``.
+
+        The class is built on first use as a subclass of the model, whose
+        ``role`` whitelists top level fields (except of hidden in ``role``).
+        Nested models keep their own roles, so their output is the same as
+        in the full serialization, and roles of the model aren't changed.
+        None is returned when too many projections were built already.
+    """
+    base_role = model_class._options.roles.get(role or 'default')
+    names = set(fields)
+    names.update([
+        name for name, serializable in model_class._serializables.items()
+        if getattr(serializable.type, 'serialized_name', None) in names
+    ])
+    names = tuple(sorted([
+        i for i in names
+        if (i in model_class._fields or i in model_class._serializables) and not (base_role and base_role(i, None))
+    ]))
+    key = (model_class, names, role)
+    projection = projections.get(key)
+    if projection is None:
+        with projections_lock:
+            if key not in projections:
+                if len(projections) >= MAX_PROJECTIONS:
+                    return
+                options = type('Options', (object,), {'roles': {role or 'default': whitelist(*names)}})
+                projections[key] = type(model_class)(model_class.__name__, (model_class,), {
+                    'Options': options,
+                    '__module__': model_class.__module__,
+                })
+            projection = projections[key]
+    return projection
+
+
+def serialize_projection(item, projection, role='view'):
+    """ Serialize model ``item`` as its ``projection`` class """
+    return to_primitive(projection, item, role=role)
+
+
+def get_fields(request):
+    """ Field names requested by ``fields`` parameter """
+    fields = request.params.get('fields')
+    if fields:
+        return [i.strip() for i in fields.split(',') if i.strip()]
+
+
+def pick_fields(data, fields):
+    return dict([(i, data[i]) for i in fields if i in data])
+
+
+def serialize_fields(request, item, role='view'):
+    """ Serialize model, only the fields requested by ``fields`` parameter if any """
+    fields = get_fields(request)
+    if not fields:
+        return item.serialize(role)
+    projection = get_projection(type(item), fields, role)
+    if projection is None:
+        return pick_fields(item.serialize(role), fields)
+    return serialize_projection(item, projection, role)
+
+
+def get_collection(request, parent, name, role='view'):
+    """ Serialized collection response.
+
+        Only fields requested by ``fields`` parameter are serialized. The
+        response is the requested page if ``offset`` or ``limit`` is given,
+        otherwise the whole collection reused for the same tender revision.
+        Collections not hydrated yet are serialized from stored data by
+        compiled serializers if the model allows it.
+    """
+    fields = get_fields(request)
+    items = parent.raw_list(name)
+    raw_serialize = items is not None and get_serializer(type(parent)._fields[name].field.model_class, role)
+    if raw_serialize:
+        parents = ((type(parent), parent),)
+        serialize = lambda i: raw_serialize(i, parents)
+        key = role
+        if fields:
+            serialize = lambda i: pick_fields(raw_serialize(i, parents), fields)
+            key = '{}:fields:{}'.format(role, ','.join(sorted(fields)))
+    else:
+        items = getattr(parent, name)
+        serialize = lambda i: i.serialize(role)
+        key = role
+        if fields and items:
+            projection = get_projection(type(items[0]), fields, role)
+            key = '{}:fields:{}'.format(role, ','.join(sorted(fields)))
+            if projection is None:
+                serialize = lambda i: pick_fields(i.serialize(role), fields)
+            else:
+                serialize = lambda i: serialize_projection(i, projection, role)
+    pagination = get_pagination(request)
+    if pagination:
+        return paginate(request, items, serialize, pagination)
+    return {'data': get_cached_serialization(request, name, key, lambda: [serialize(i) for i in items],
+                                             has_documents(type(parent)._fields[name].field.model_class))}
+
+
+def get_documents_collection(request, path, parent):
+    all_versions = bool(request.params.get('all', ''))
+    pagination = get_pagination(request)
+    if pagination:
+        documents = parent.documents if all_versions else get_document_index(parent).latest()
+        return paginate(request, documents, lambda i: i.serialize('view'), pagination)
+    if all_versions:
+        path += '?all=1'
+    return {'data': get_cached_serialization(request, path, 'view',
+                                             lambda: serialize_documents(parent, all_versions), True)}
+
+
+def get_etag(request):
+    """ Strong ETag of the requested tender sub-object (or collection) """
+    tender = request.validated['tender']
+    return md5(u'{}:{}'.format(tender.rev, request.path_qs).encode('utf-8')).hexdigest()
+
+
+def conditional_view(view):
+    """ Set ETag on the response and answer 304 Not Modified when the client
+        already has the current version (If-None-Match).
+    """
+    @wraps(view)
+    def wrapper(self):
+        if not self.request.validated['tender'].rev:
+            return view(self)
+        etag = get_etag(self.request)
+        if etag in self.request.if_none_match:
+            return HTTPNotModified(etag=etag)
+        self.request.response.etag = etag
+        return view(self)
+    return wrapper
+
+
+def compile_transitions(transitions):
+    """ Build status transition lookup from (from, to, guard, effect) rows.
+
+        Rows for the same pair of statuses are kept in the given order,
+        the first one with passing guard (or without guard) wins.
+    """
+    table = {}
+    for from_status, to_status, guard, effect in transitions:
+        table.setdefault((from_status, to_status), []).append((guard, effect))
+    return table
+
+
+def rebase_request(request, name):
+    """ Reload tender of request and its ``name`` (award, contract) context
+        from database, as traversal does.
+    """
+    old_tender = request.validated['tender']
+    tender = extract_tender_adapter(request, old_tender.id)
+    items = [i for i in getattr(tender, '{}s'.format(name)) if i.id == request.context.id]
+    if not items:
+        return False
+    tender.__parent__ = old_tender.__parent__
+    request.validated['tender'] = tender
+    if 'db_doc' in request.validated:
+        request.validated['db_doc'] = tender
+    request.validated['tender_status'] = tender.status
+    request.validated['tender_src'] = tender.serialize('plain')
+    request.validated[name] = request.context = items[0]
+    return True
+
+
+def save_rebased(request, name, update, validators=()):
+    """ Apply ``update(context)`` to request context and save tender.
+
+        On revision conflict tender is reloaded, ``validators`` are re-run
+        against the fresh revision and ``update`` is applied again, at most
+        REBASE_ATTEMPTS times. Resources keep them as ``rebase_validators``:
+        validators of the tender state around context and, for patches,
+        the patch data validator first, so request data is validated
+        again against the reloaded context and fields changed concurrently
+        are kept.
+    """
+    update(request.context)
+    attempt = 0
+    while not save_tender(request):
+        if request.errors.status != 409 or attempt == REBASE_ATTEMPTS or not rebase_request(request, name):
+            return False
+        attempt += 1
+        del request.errors[:]
+        request.errors.status = 400
+        LOGGER.info('Rebased {} {} on tender revision {}'.format(name, request.context.id, request.validated['tender'].rev),
+                    extra=context_unpack(request, {'MESSAGE_ID': 'tender_rebase'}, {'REBASE_ATTEMPT': attempt}))
+        for validator in validators:
+            validator(request)
+        if request.errors:
+            raise error_handler(request.errors)
+        update(request.context)
+    return True
+
+
+CONTRACT_ITEM_REFERENCES = 'contractItemReferences'  # marks stored tenders with contract item references
+
+
+def is_item_reference(item):
+    return set(item) <= set(['id', 'unit'])
+
+
+def compact_contract_items(data):
+    """ Replace contract items, that are copies of tender items, with
+        references ``{"id": ..., "unit": {"value": ...}}`` in tender data
+        prepared for storage.
+
+        Only ``unit.value`` may differ from the tender item, any other
+        change keeps the contract item stored in full. Data with references
+        is marked with ``contractItemReferences``, so tenders without them
+        are loaded as is.
+    """
+    items = dict([(i['id'], i) for i in data.get('items', [])])
+    for contract in data.get('contracts', []):
+        contract_items = []
+        for item in contract.get('items', []):
+            origin = items.get(item.get('id'))
+            if origin is None or ('unit' in item) != ('unit' in origin):
+                contract_items.append(item)
+                continue
+            reference = {'id': item['id']}
+            if 'unit' in item:
+                unit = dict(item['unit'])
+                origin_unit = dict(origin['unit'])
+                origin_unit.pop('value', None)
+                reference['unit'] = {'value': unit.pop('value')} if 'value' in unit else {}
+                if unit != origin_unit:
+                    contract_items.append(item)
+                    continue
+            if dict(item, unit=None) != dict(origin, unit=None):
+                contract_items.append(item)
+                continue
+            contract_items.append(reference)
+            data[CONTRACT_ITEM_REFERENCES] = True
+        if contract_items:
+            contract['items'] = contract_items
+    return data
+
+
+def expand_contract_items(data):
+    """ Materialize contract items stored by :func:`compact_contract_items` """
+    if not data or not data.get(CONTRACT_ITEM_REFERENCES):
+        return data
+    items = dict([(i['id'], i) for i in data.get('items', [])])
+    data = dict(data)
+    del data[CONTRACT_ITEM_REFERENCES]
+    data['contracts'] = contracts = [dict(contract) for contract in data['contracts']]
+    for contract in contracts:
+        contract_items = []
+        for item in contract.get('items', []):
+            if is_item_reference(item) and item['id'] in items:
+                reference = item
+                item = dict(items[reference['id']])
+                if 'unit' in reference:
+                    item['unit'] = unit = dict(item['unit'])
+                    unit.pop('value', None)
+                    unit.update(reference['unit'])
+            contract_items.append(item)
+        if contract_items:
+            contract['items'] = contract_items
+    return data
+
+
+class MultipartFileStream(object):
+    """ multipart/form-data body with a single file field.
+
+        The file is read by chunks while the body is sent and its MD5 hash
+        is calculated on the way, so the body is never kept in memory.
+    """
+
+    def __init__(self, in_file, filename, content_type, name='file'):
+        self.boundary = uuid4().hex
+        head = u'--{}\r\nContent-Disposition: form-data; name="{}"; filename="{}"\r\nContent-Type: {}\r\n\r\n'.format(
+            self.boundary, name, filename.replace(u'"', u'\\"'), content_type).encode('utf-8')
+        tail = '\r\n--{}--\r\n'.format(self.boundary)
+        in_file.seek(0, 2)
+        self.length = len(head) + in_file.tell() + len(tail)
+        in_file.seek(0)
+        self.in_file = in_file
+        self.parts = [BytesIO(head), in_file, BytesIO(tail)]
+        self.md5 = md5()
+        self.size = 0
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    @property
+    def hash(self):
+        return 'md5:{}'.format(self.md5.hexdigest())
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length
+        data = []
+        left = size
+        while self.parts and left > 0:
+            part = self.parts[0]
+            chunk = part.read(left)
+            if not chunk:
+                self.parts.pop(0)
+                continue
+            if part is self.in_file:
+                self.md5.update(chunk)
+                self.size += len(chunk)
+            data.append(chunk)
+            left -= len(chunk)
+        return b''.join(data)
+
+    def __iter__(self):
+        chunk = self.read(UPLOAD_CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = self.read(UPLOAD_CHUNK_SIZE)
+
+
+class DocumentHashMismatch(Exception):
+    """ Document service hash differs from hash of the uploaded file """
+
+
+def is_limited_request():
+    request = get_current_request()
+    tender = getattr(request, 'validated', {}).get('tender')
+    return getattr(tender, 'procurementMethodType', None) in LIMITED_TYPES
+
+
+class DocumentServiceSession(Session):
+    """ Document service session of the api upload_file.
+
+        The api upload_file posts ``files={'file': (filename, file, content_type)}``,
+        which requests encodes in memory, and retries failed posts. Files
+        of limited tenders are streamed by chunks instead, with MD5 hash
+        calculated on the way, so worker memory does not depend on the
+        file size; a post whose document service hash differs from the
+        hash of the sent file fails and is retried. Installed as the api
+        ``SESSION`` by includeme.
+    """
+
+    def post(self, url, data=None, json=None, **kwargs):
+        if not kwargs.get('files') or data is not None or not is_limited_request():
+            return super(DocumentServiceSession, self).post(url, data=data, json=json, **kwargs)
+        filename, in_file, content_type = list(kwargs.pop('files').values())[0][:3]
+        body = MultipartFileStream(in_file, filename, content_type)
+        kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'Content-Type': body.content_type})
+        response = super(DocumentServiceSession, self).post(url, data=body, json=json, **kwargs)
+        if response.status_code == 200:
+            doc_hash = response.json().get('data', {}).get('hash')
+            if doc_hash != body.hash:
+                # file was corrupted on the way to document service, the api uploads it again
+                raise DocumentHashMismatch('Document service hash {} differs from uploaded file hash {}'.format(
+                    doc_hash, body.hash))
+        return response
\ No newline at end of file
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from collections import Counter
+from pyramid.httpexceptions import HTTPError
+from schematics.exceptions import ModelValidationError, ModelConversionError
 from openprocurement.api.validation import validate_data, OPERATIONS
 from openprocurement.api.utils import update_logging_context, error_handler, get_now, raise_operation_error  # XXX tender context
 
@@ -65,7 +68,7 @@ def validate_create_new_award(request):
 def validate_lot_cancellation(request):
     tender = request.validated['tender']
     award = request.validated['award']
-    if tender.get('lots') and tender.get('cancellations') and [cancellation for cancellation in tender.get('cancellations', []) if cancellation.get('relatedLot') == award.lotID]:
+    if tender.get('lots') and tender.get_lot_index().cancellations.get(award.lotID):
         raise_operation_error(request, 'Can\'t {} award while cancellation for corresponding lot exists'.format(OPERATIONS.get(request.method)))
 
 
@@ -74,11 +77,86 @@ def validate_create_new_award_with_lots(request):
     award = request.validated['award']
     if tender.awards:
         if tender.lots:  # If tender with lots
-            if award.lotID in [aw.lotID for aw in tender.awards if aw.status in ['pending', 'active']]:
+            if any([aw.status in ['pending', 'active'] for aw in tender.get_lot_index().awards.get(award.lotID, [])]):
                 raise_operation_error(request, 'Can\'t create new award on lot while any ({}) award exists'.format(tender.awards[-1].status))
         else:
             validate_create_new_award(request)
 
+def validate_bulk_json_data(request):
+    """ Objects list from request body, rejecting objects with the same ``id`` """
+    try:
+        json = request.json_body
+    except ValueError as e:
+        request.errors.add('body', 'data', e.message)
+        request.errors.status = 422
+        raise error_handler(request.errors)
+    if not isinstance(json, dict) or not isinstance(json.get('data'), list) or not json['data'] or \
+            not all([isinstance(i, dict) for i in json['data']]):
+        request.errors.add('body', 'data', "Data not available")
+        request.errors.status = 422
+        raise error_handler(request.errors)
+    ids = Counter([i['id'] for i in json['data'] if isinstance(i.get('id'), basestring)])
+    if any([count > 1 for count in ids.values()]):
+        request.errors.add('body', 'data', [
+            {'id': ['duplicate id']} if ids.get(i.get('id'), 0) > 1 else {}
+            for i in json['data']
+        ])
+        request.errors.status = 422
+        raise error_handler(request.errors)
+    return json['data']
+
+
+def validate_award_bulk_data(request):
+    update_logging_context(request, {'award_id': '__new__'})
+    items = validate_bulk_json_data(request)
+    model = type(request.tender).awards.model_class
+    namespace = (model._options.namespace or model.__name__).lower()
+    awards = []
+    errors = []
+    for data in items:
+        try:
+            validate_data(request, model, data=data)
+        except HTTPError:
+            if request.errors.status != 422:
+                raise
+            errors.append(dict([(i['name'], i['description']) for i in request.errors]))
+            del request.errors[:]
+            request.errors.status = 400
+        else:
+            awards.append(request.validated.pop(namespace))
+            errors.append({})
+    request.validated.pop('data', None)
+    if any(errors):
+        request.errors.add('body', 'data', errors)
+        request.errors.status = 422
+        raise error_handler(request.errors)
+    request.validated['awards'] = awards
+
+
+def validate_create_new_awards_bulk(request):
+    tender = request.validated['tender']
+    lot_index = tender.get_lot_index()
+    lot_awards_statuses = {}
+    errors = []
+    for award in request.validated['awards']:
+        if award.lotID not in lot_awards_statuses:
+            lot_awards_statuses[award.lotID] = [
+                aw.status for aw in lot_index.awards.get(award.lotID, [])
+                if aw.status in ['pending', 'active']
+            ]
+        statuses = lot_awards_statuses[award.lotID]
+        if tender.lots and lot_index.cancellations.get(award.lotID):
+            errors.append({'lotID': ['Can\'t add award while cancellation for corresponding lot exists']})
+        elif statuses:
+            errors.append({'lotID': ['Can\'t create new award on lot while any ({}) award exists'.format(statuses[-1])]})
+        else:
+            errors.append({})
+        statuses.append(award.status)
+    if any(errors):
+        request.errors.add('body', 'data', errors)
+        request.errors.status = 403
+        raise error_handler(request.errors)
+
 # award document
 def validate_document_operation_not_in_active(request):
     if request.validated['tender_status'] != 'active':
@@ -106,22 +184,75 @@ def validate_contract_update_in_cancelled(request):
         raise_operation_error(request, 'Can\'t update contract in current ({}) status'.format(request.context.status))
 
 
+def get_contract_signing_error(tender, contract, now):
+    lot_index = tender.get_lot_index()
+    award = lot_index.awards_by_id[contract.awardID]
+    if tender.get('lots') and lot_index.cancellations.get(award.lotID):
+        return 'Can\'t update contract while cancellation for corresponding lot exists'
+    stand_still_end = award.complaintPeriod.endDate
+    if stand_still_end > now:
+        return 'Can\'t sign contract before stand-still period end ({})'.format(stand_still_end.isoformat())
+    if lot_index.complaints(award.lotID, tender.block_complaint_status):
+        return 'Can\'t sign contract before reviewing all complaints'
+
+
 def validate_contract_with_cancellations_and_contract_signing(request):
     data = request.validated['data']
     if request.context.status != 'active' and 'status' in data and data['status'] == 'active':
-        tender = request.validated['tender']
-        award = [a for a in tender.awards if a.id == request.context.awardID][0]
-        if tender.get('lots') and tender.get('cancellations') and [cancellation for cancellation in tender.get('cancellations') if cancellation.get('relatedLot') == award.lotID]:
-            raise_operation_error(request, 'Can\'t update contract while cancellation for corresponding lot exists')
-        stand_still_end = award.complaintPeriod.endDate
-        if stand_still_end > get_now():
-            raise_operation_error(request, 'Can\'t sign contract before stand-still period end ({})'.format(stand_still_end.isoformat()))
-        if any([
-            i.status in tender.block_complaint_status and a.lotID == award.lotID
-            for a in tender.awards
-            for i in a.complaints
-        ]):
-            raise_operation_error(request, 'Can\'t sign contract before reviewing all complaints')
+        error = get_contract_signing_error(request.validated['tender'], request.context, get_now())
+        if error:
+            raise_operation_error(request, error)
+
+
+def validate_contract_bulk_signing_data(request):
+    update_logging_context(request, {'contract_id': '__bulk__'})
+    items = validate_bulk_json_data(request)
+    tender = request.validated['tender']
+    model = type(tender).contracts.model_class
+    tender_contracts = dict([(i.id, i) for i in tender.contracts])
+    contracts = []
+    errors = []
+    for data in items:
+        contract = tender_contracts.pop(data.get('id'), None)
+        if contract is None:
+            errors.append({'id': ['id should be one of contracts']})
+            continue
+        if data.get('status', 'active') != 'active':
+            errors.append({'status': ['Only contract signing is allowed']})
+            continue
+        signed = dict(contract.serialize(), status='active')
+        if data.get('dateSigned'):
+            signed['dateSigned'] = data['dateSigned']
+        try:
+            signed = model(signed)
+            signed.__parent__ = request.context
+            signed.validate()
+        except (ModelValidationError, ModelConversionError) as e:
+            errors.append(e.message)
+        else:
+            contracts.append((contract, signed.dateSigned))
+            errors.append({})
+    if any(errors):
+        request.errors.add('body', 'data', errors)
+        request.errors.status = 422
+        raise error_handler(request.errors)
+    request.validated['contracts'] = contracts
+
+
+def validate_contracts_bulk_signing(request):
+    tender = request.validated['tender']
+    now = get_now()
+    errors = []
+    for contract, date_signed in request.validated['contracts']:
+        if contract.status != 'pending':
+            error = 'Can\'t sign contract in current ({}) status'.format(contract.status)
+        else:
+            error = get_contract_signing_error(tender, contract, now)
+        errors.append({'status': [error]} if error else {})
+    if any(errors):
+        request.errors.add('body', 'data', errors)
+        request.errors.status = 403
+        raise error_handler(request.errors)
 
 
 def validate_contract_items_count_modification(request):
@@ -2,7 +2,6 @@
 from datetime import timedelta
 from openprocurement.api.utils import (
     get_now,
-    json_view,
     context_unpack,
     APIResource,
     error_handler,
@@ -10,8 +9,9 @@ from openprocurement.api.utils import (
 )
 
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource, calculate_business_date
+    optendersresource, calculate_business_date
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 
 from openprocurement.tender.core.validation import (
     validate_patch_award_data, validate_award_data,
@@ -23,7 +23,12 @@ from openprocurement.tender.limited.validation import (
     validate_create_new_award,
     validate_lot_cancellation,
     validate_create_new_award_with_lots,
-    validate_award_operation_not_in_active_status
+    validate_award_operation_not_in_active_status,
+    validate_award_bulk_data,
+    validate_create_new_awards_bulk
+)
+from openprocurement.tender.limited.utils import (
+    get_collection, serialize_fields, conditional_view, compile_transitions, save_rebased
 )
 
 
@@ -34,8 +39,17 @@ from openprocurement.tender.limited.validation import (
                    procurementMethodType='reporting',
                    )
 class TenderAwardResource(APIResource):
+    transitions = compile_transitions([
+        # (from status, to status, guard, effect)
+        ('pending', 'pending', None, None),
+        ('pending', 'active', None, 'activate_award'),
+        ('pending', 'unsuccessful', None, None),
+        ('active', 'cancelled', None, 'cancel_award'),
+    ])
+    rebase_validators = (validate_patch_award_data, validate_award_operation_not_in_active_status)
 
     @json_view(permission='view_tender')
+    @conditional_view
     def collection_get(self):
         """Tender Awards List
 
@@ -88,7 +102,8 @@ class TenderAwardResource(APIResource):
             }
 
         """
-        return {'data': [i.serialize("view") for i in self.request.validated['tender'].awards]}
+        tender = self.request.validated['tender']
+        return get_collection(self.request, tender, 'awards')
 
     @json_view(content_type="application/json", permission='edit_tender', validators=(validate_award_data, validate_award_operation_not_in_active_status,validate_create_new_award))
     def collection_post(self):
@@ -183,6 +198,7 @@ class TenderAwardResource(APIResource):
             return {'data': award.serialize("view")}
 
     @json_view(permission='view_tender')
+    @conditional_view
     def get(self):
         """Retrieving the award
 
@@ -232,7 +248,7 @@ class TenderAwardResource(APIResource):
             }
 
         """
-        return {'data': self.request.validated['award'].serialize("view")}
+        return {'data': serialize_fields(self.request, self.request.validated['award'])}
 
     @json_view(content_type="application/json", permission='edit_tender', validators=(validate_patch_award_data, validate_award_operation_not_in_active_status))
     def patch(self):
@@ -292,36 +308,54 @@ class TenderAwardResource(APIResource):
             }
 
         """
-        tender = self.request.validated['tender']
-        award = self.request.context
-        award_status = award.status
-        apply_patch(self.request, save=False, src=self.request.context.serialize())
-        if award_status == 'pending' and award.status == 'active':
-            tender.contracts.append(type(tender).contracts.model_class({
-                'awardID': award.id,
-                'suppliers': award.suppliers,
-                'date': get_now(),
-                'value': award.value,
-                'items': tender.items,
-                'contractID': '{}-{}{}'.format(tender.tenderID, self.server_id, len(tender.contracts) + 1)}))
-            # add_next_award(self.request)
-        elif award_status == 'active' and award.status == 'cancelled':
-            for i in tender.contracts:
-                if i.awardID == award.id:
-                    i.status = 'cancelled'
-            # add_next_award(self.request)
-        elif award_status == 'pending' and award.status == 'unsuccessful':
-            pass
-            # add_next_award(self.request)
-        elif award_status != award.status:
-            raise_operation_error(self.request, 'Can\'t update award in current ({}) status'.format(award_status))
-        elif award_status != 'pending':
-            raise_operation_error(self.request, 'Can\'t update award in current ({}) status'.format(award_status))
-
-        if save_tender(self.request):
+        if save_rebased(self.request, 'award', self.update_award, self.rebase_validators):
             self.LOGGER.info('Updated tender award {}'.format(self.request.context.id),
-                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_award_patch'}, {'TENDER_REV': tender.rev}))
-            return {'data': award.serialize("view")}
+                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_award_patch'}, {'TENDER_REV': self.request.validated['tender'].rev}))
+            return {'data': self.request.context.serialize("view")}
+
+    def update_award(self, award):
+        award_status = award.status
+        data = self.request.validated['data']
+        self.check_award_data(award, data)
+        effect = self.check_award_transition(award, award_status, data.get('status') or award_status)
+        apply_patch(self.request, save=False, src=award.serialize())
+        self.check_patched_award(award)
+        if effect:
+            getattr(self, effect)(award)
+
+    def check_award_transition(self, award, award_status, status):
+        """ Return name of the effect of award status change from ``award_status`` to ``status`` """
+        for guard, effect in self.transitions.get((award_status, status), []):
+            if guard is None or getattr(self, guard)(award):
+                return effect
+        raise_operation_error(self.request, 'Can\'t update award in current ({}) status'.format(award_status))
+
+    def check_award_data(self, award, data):
+        """ Check patched award ``data`` before it is applied """
+
+    def check_patched_award(self, award):
+        pass
+
+    def get_contract_items(self, award):
+        return self.request.validated['tender'].items
+
+    def activate_award(self, award):
+        tender = self.request.validated['tender']
+        number = tender.allocate_number('contracts', lambda: len(tender.contracts))
+        tender.contracts.append(type(tender).contracts.model_class({
+            'awardID': award.id,
+            'suppliers': award.suppliers,
+            'date': get_now(),
+            'value': award.value,
+            'items': self.get_contract_items(award),
+            'contractID': '{}-{}{}'.format(tender.tenderID, self.server_id, number)}))
+        # add_next_award(self.request)
+
+    def cancel_award(self, award):
+        for i in self.request.validated['tender'].contracts:
+            if i.awardID == award.id:
+                i.status = 'cancelled'
+        # add_next_award(self.request)
 
 
 @optendersresource(name='negotiation:Tender Awards',
@@ -332,6 +366,20 @@ class TenderAwardResource(APIResource):
 class TenderNegotiationAwardResource(TenderAwardResource):
     """ Tender Negotiation Award Resource """
     stand_still_delta = timedelta(days=10)
+    transitions = compile_transitions([
+        # (from status, to status, guard, effect)
+        ('pending', 'pending', None, None),
+        ('pending', 'active', None, 'activate_award'),
+        ('pending', 'unsuccessful', None, 'reject_award'),
+        ('active', 'cancelled', 'has_satisfied_complaints', 'cancel_lot_awards'),
+        ('active', 'cancelled', None, 'cancel_award'),
+        ('unsuccessful', 'cancelled', 'has_satisfied_complaints', 'cancel_lot_awards'),
+        ('active', 'active', 'is_administrator', None),
+        ('unsuccessful', 'unsuccessful', 'is_administrator', None),
+        ('cancelled', 'cancelled', 'is_administrator', None),
+    ])
+    rebase_validators = (validate_patch_award_data, validate_award_operation_not_in_active_status,
+                         validate_lot_cancellation)
 
     @json_view(content_type="application/json", permission='edit_tender', validators=(validate_award_data, validate_award_operation_not_in_active_status, validate_lot_cancellation, validate_create_new_award_with_lots))
     def collection_post(self):
@@ -484,75 +532,64 @@ class TenderNegotiationAwardResource(TenderAwardResource):
             }
 
         """
-        tender = self.request.validated['tender']
-        award = self.request.context
-        award_status = award.status
-        apply_patch(self.request, save=False, src=self.request.context.serialize())
-        if award.status == "active" and not award.qualified:
+        return super(TenderNegotiationAwardResource, self).patch()
+
+    def check_award_data(self, award, data):
+        if data.get('status', award.status) == "active" and not data.get('qualified', award.qualified):
             raise_operation_error(self.request, 'Can\'t update award to active status with not qualified')
 
-        if award.lotID and \
-                [aw.lotID for aw in tender.awards if aw.status in['pending', 'active']].count(award.lotID) > 1:
+        lot_id = data.get('lotID', award.lotID)
+        if lot_id and data.get('status', award.status) in ['pending', 'active'] and any([
+            aw.status in ['pending', 'active']
+            for aw in self.request.validated['tender'].get_lot_index().awards.get(lot_id, [])
+            if aw.id != award.id
+        ]):
             self.request.errors.add('body', 'lotID', 'Another award is already using this lotID.')
             self.request.errors.status = 403
             raise error_handler(self.request.errors)
-        if award_status == 'pending' and award.status == 'active':
-            normalized_end = calculate_normalized_date(get_now(), tender, True)
-            award.complaintPeriod.endDate = calculate_business_date(normalized_end, self.stand_still_delta, tender)
-            tender.contracts.append(type(tender).contracts.model_class({
-                'awardID': award.id,
-                'suppliers': award.suppliers,
-                'date': get_now(),
-                'value': award.value,
-                'items': [i for i in tender.items if i.relatedLot == award.lotID],
-                'contractID': '{}-{}{}'.format(tender.tenderID, self.server_id, len(tender.contracts) + 1)}))
-            # add_next_award(self.request)
-        elif award_status == 'active' and award.status == 'cancelled' and any([i.status == 'satisfied' for i in award.complaints]):
-            now = get_now()
-            cancelled_awards = []
-            for i in tender.awards:
-                if i.lotID != award.lotID:
-                    continue
-                if not i.complaintPeriod.endDate or i.complaintPeriod.endDate > now:
-                    i.complaintPeriod.endDate = now
-                i.status = 'cancelled'
-                cancelled_awards.append(i.id)
-            for i in tender.contracts:
-                if i.awardID in cancelled_awards:
-                    i.status = 'cancelled'
-        elif award_status == 'active' and award.status == 'cancelled':
-            now = get_now()
-            if award.complaintPeriod.endDate > now:
-                award.complaintPeriod.endDate = now
-            for i in tender.contracts:
-                if i.awardID == award.id:
-                    i.status = 'cancelled'
-            # add_next_award(self.request)
-        elif award_status == 'pending' and award.status == 'unsuccessful':
-            award.complaintPeriod.endDate = get_now()
-            # add_next_award(self.request)
-        elif award_status == 'unsuccessful' and award.status == 'cancelled' and any([i.status == 'satisfied' for i in award.complaints]):
-            now = get_now()
-            cancelled_awards = []
-            for i in tender.awards:
-                if i.lotID != award.lotID:
-                    continue
-                if not i.complaintPeriod.endDate or i.complaintPeriod.endDate > now:
-                    i.complaintPeriod.endDate = now
-                i.status = 'cancelled'
-                cancelled_awards.append(i.id)
-            for i in tender.contracts:
-                if i.awardID in cancelled_awards:
-                    i.status = 'cancelled'
-        elif award_status != award.status:
-            raise_operation_error(self.request, 'Can\'t update award in current ({}) status'.format(award_status))
-        elif self.request.authenticated_role != 'Administrator' and award_status != 'pending':
-            raise_operation_error(self.request, 'Can\'t update award in current ({}) status'.format(award_status))
 
-        if save_tender(self.request):
-            self.LOGGER.info('Updated tender award {}'.format(self.request.context.id),
-                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_award_patch'}, {'TENDER_REV': tender.rev}))
-            return {'data': award.serialize("view")}
+    def check_patched_award(self, award):
+        self.request.validated['tender'].invalidate_lot_index()  # lotID could be changed by patch
+
+    def get_contract_items(self, award):
+        return [i for i in self.request.validated['tender'].items if i.relatedLot == award.lotID]
+
+    def has_satisfied_complaints(self, award):
+        return any([i.status == 'satisfied' for i in award.complaints])
+
+    def is_administrator(self, award):
+        return self.request.authenticated_role == 'Administrator'
+
+    def activate_award(self, award):
+        tender = self.request.validated['tender']
+        normalized_end = calculate_normalized_date(get_now(), tender, True)
+        award.complaintPeriod.endDate = calculate_business_date(normalized_end, self.stand_still_delta, tender)
+        super(TenderNegotiationAwardResource, self).activate_award(award)
+
+    def reject_award(self, award):
+        award.complaintPeriod.endDate = get_now()
+        # add_next_award(self.request)
+
+    def cancel_award(self, award):
+        now = get_now()
+        if award.complaintPeriod.endDate > now:
+            award.complaintPeriod.endDate = now
+        super(TenderNegotiationAwardResource, self).cancel_award(award)
+
+    def cancel_lot_awards(self, award):
+        tender = self.request.validated['tender']
+        now = get_now()
+        cancelled_awards = []
+        for i in tender.awards:
+            if i.lotID != award.lotID:
+                continue
+            if not i.complaintPeriod.endDate or i.complaintPeriod.endDate > now:
+                i.complaintPeriod.endDate = now
+            i.status = 'cancelled'
+            cancelled_awards.append(i.id)
+        for i in tender.contracts:
+            if i.awardID in cancelled_awards:
+                i.status = 'cancelled'
 
 
 @optendersresource(name='negotiation.quick:Tender Awards',
@@ -563,3 +600,39 @@ class TenderNegotiationAwardResource(TenderAwardResource):
 class TenderNegotiationQuickAwardResource(TenderNegotiationAwardResource):
     """ Tender Negotiation Quick Award Resource """
     stand_still_delta = timedelta(days=5)
+
+
+@optendersresource(name='negotiation:Tender Awards Bulk',
+                   path='/tenders/{tender_id}/bulk/awards',
+                   description="Tender awards bulk creation",
+                   procurementMethodType='negotiation')
+class TenderNegotiationAwardBulkResource(APIResource):
+    """ Tender Negotiation Award Bulk Resource """
+
+    @json_view(content_type="application/json", permission='edit_tender', validators=(validate_award_bulk_data, validate_award_operation_not_in_active_status, validate_create_new_awards_bulk))
+    def post(self):
+        """Create several awards at once
+
+        Awards are validated together and stored in a single tender revision.
+        If any of them is invalid, nothing is created and ``errors`` holds
+        one entry per posted award (empty for valid ones).
+        """
+        tender = self.request.validated['tender']
+        awards = self.request.validated['awards']
+        now = get_now()
+        for award in awards:
+            award.complaintPeriod = {'startDate': now.isoformat()}
+            tender.awards.append(award)
+        if save_tender(self.request):
+            self.LOGGER.info('Created tender awards {}'.format(', '.join([award.id for award in awards])),
+                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_award_bulk_create'}))
+            self.request.response.status = 201
+            return {'data': [award.serialize("view") for award in awards]}
+
+
+@optendersresource(name='negotiation.quick:Tender Awards Bulk',
+                   path='/tenders/{tender_id}/bulk/awards',
+                   description="Tender awards bulk creation",
+                   procurementMethodType='negotiation.quick')
+class TenderNegotiationQuickAwardBulkResource(TenderNegotiationAwardBulkResource):
+    """ Tender Negotiation Quick Award Bulk Resource """
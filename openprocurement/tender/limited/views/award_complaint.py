@@ -2,14 +2,14 @@
 from openprocurement.api.utils import (
     get_now,
     context_unpack,
-    json_view,
     set_ownership,
     raise_operation_error
 )
 
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 
 from openprocurement.tender.core.validation import (
     validate_add_complaint_not_in_complaint_period,
@@ -21,6 +21,7 @@ from openprocurement.tender.limited.validation import (
     validate_patch_complaint_data,
     validate_award_complaint_operation_not_in_active
 )
+from openprocurement.tender.limited.utils import conditional_view, save_rebased
 
 from openprocurement.tender.belowthreshold.views.award_complaint import (
     TenderAwardComplaintResource
@@ -33,13 +34,27 @@ from openprocurement.tender.belowthreshold.views.award_complaint import (
                    procurementMethodType='negotiation',
                    description="Tender negotiation award complaints")
 class TenderNegotiationAwardComplaintResource(TenderAwardComplaintResource):
+    rebase_validators = (validate_award_complaint_operation_not_in_active, validate_add_complaint_not_in_complaint_period)
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def collection_get(self):
+        """List complaints for award
+        """
+        return super(TenderNegotiationAwardComplaintResource, self).collection_get()
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def get(self):
+        """Retrieving the complaint for award
+        """
+        return super(TenderNegotiationAwardComplaintResource, self).get()
 
     @json_view(content_type="application/json", permission='create_award_complaint', validators=(validate_complaint_data, validate_award_complaint_operation_not_in_active,
                validate_add_complaint_not_in_complaint_period))
     def collection_post(self):
         """Post a complaint for award
         """
-        tender = self.request.validated['tender']
         complaint = self.request.validated['complaint']
         complaint.date = get_now()
         complaint.type = 'complaint'
@@ -47,10 +62,9 @@ class TenderNegotiationAwardComplaintResource(TenderAwardComplaintResource):
             complaint.dateSubmitted = get_now()
         else:
             complaint.status = 'draft'
-        complaint.complaintID = '{}.{}{}'.format(tender.tenderID, self.server_id, sum([len(i.complaints) for i in tender.awards], 1))
         set_ownership(complaint, self.request)
-        self.context.complaints.append(complaint)
-        if save_tender(self.request):
+        if save_rebased(self.request, 'award', self.add_complaint, self.rebase_validators):
+            tender = self.request.validated['tender']
             self.LOGGER.info('Created tender award complaint {}'.format(complaint.id),
                         extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_award_complaint_create'}, {'complaint_id': complaint.id}))
             self.request.response.status = 201
@@ -65,6 +79,15 @@ class TenderNegotiationAwardComplaintResource(TenderAwardComplaintResource):
                 }
             }
 
+    def add_complaint(self, award):
+        """ Number request complaint from the tender sequence and add it to ``award`` """
+        tender = self.request.validated['tender']
+        complaint = self.request.validated['complaint']
+        number = tender.allocate_number('complaints', lambda: sum([len(i.complaints) for i in tender.awards]))
+        complaint.complaintID = '{}.{}{}'.format(tender.tenderID, self.server_id, number)
+        complaint.__parent__ = award
+        award.complaints.append(complaint)
+
     @json_view(content_type="application/json", permission='edit_complaint', validators=(validate_patch_complaint_data, validate_award_complaint_operation_not_in_active,
                validate_update_complaint_not_in_allowed_complaint_status))
     def patch(self):
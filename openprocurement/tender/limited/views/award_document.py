@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    get_file, upload_file, update_file_content_type, json_view,
+    get_file, upload_file, update_file_content_type,
     context_unpack, APIResource
 )
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 from openprocurement.api.validation import (
     validate_file_update, validate_file_upload, validate_patch_document_data
 )
@@ -13,6 +14,9 @@ from openprocurement.tender.limited.validation import (
     validate_award_document_add_not_in_pending,
     validate_document_operation_not_in_active
 )
+from openprocurement.tender.limited.utils import (
+    get_documents_collection, get_previous_versions, conditional_view
+)
 
 
 @optendersresource(name='reporting:Tender Award Documents',
@@ -23,17 +27,11 @@ from openprocurement.tender.limited.validation import (
 class TenderAwardDocumentResource(APIResource):
 
     @json_view(permission='view_tender')
+    @conditional_view
     def collection_get(self):
         """Tender Award Documents List"""
         award = self.request.validated['award']
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in award['documents']]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in award['documents']
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        return get_documents_collection(self.request, 'awards/{}/documents'.format(award.id), award)
 
     @json_view(validators=(validate_file_upload, validate_document_operation_not_in_active, validate_award_document_add_not_in_pending), permission='edit_tender')
     def collection_post(self):
@@ -50,17 +48,14 @@ class TenderAwardDocumentResource(APIResource):
             return {'data': document.serialize("view")}
 
     @json_view(permission='view_tender')
+    @conditional_view
     def get(self):
         """Tender Award Document Read"""
         if self.request.params.get('download'):
             return get_file(self.request)
         document = self.request.validated['document']
         document_data = document.serialize("view")
-        document_data['previousVersions'] = [
-            i.serialize("view")
-            for i in self.request.validated['documents']
-            if i.url != document.url
-        ]
+        document_data['previousVersions'] = get_previous_versions(self.request.validated['award'], document)
         return {'data': document_data}
 
     @json_view(validators=(validate_file_update, validate_document_operation_not_in_active), permission='edit_tender')
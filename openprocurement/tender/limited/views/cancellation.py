@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    json_view, context_unpack, APIResource, get_now, raise_operation_error
+    context_unpack, APIResource, get_now, raise_operation_error
 )
 
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 
 from openprocurement.tender.core.validation import (
     validate_cancellation_data, validate_patch_cancellation_data,
@@ -16,6 +17,7 @@ from openprocurement.tender.belowthreshold.views.cancellation import (
 )
 
 from openprocurement.tender.limited.validation import validate_cancellation_in_termainated_status
+from openprocurement.tender.limited.utils import get_collection, serialize_fields, conditional_view
 
 
 @optendersresource(name='reporting:Tender Cancellations',
@@ -44,16 +46,19 @@ class TenderReportingCancellationResource(APIResource):
             return {'data': cancellation.serialize("view")}
 
     @json_view(permission='view_tender')
+    @conditional_view
     def collection_get(self):
         """List cancellations
         """
-        return {'data': [i.serialize("view") for i in self.request.validated['tender'].cancellations]}
+        tender = self.request.validated['tender']
+        return get_collection(self.request, tender, 'cancellations')
 
     @json_view(permission='view_tender')
+    @conditional_view
     def get(self):
         """Retrieving the cancellation
         """
-        return {'data': self.request.validated['cancellation'].serialize("view")}
+        return {'data': serialize_fields(self.request, self.request.validated['cancellation'])}
 
     @json_view(content_type="application/json", validators=(validate_patch_cancellation_data, validate_cancellation_in_termainated_status), permission='edit_tender')
     def patch(self):
@@ -77,6 +82,25 @@ class TenderReportingCancellationResource(APIResource):
 class TenderNegotiationCancellationResource(TenderCancellationResource):
     """ Tender Negotiation Cancellation Resource """
 
+    @json_view(permission='view_tender')
+    @conditional_view
+    def collection_get(self):
+        """List cancellations
+        """
+        tender = self.request.validated['tender']
+        return get_collection(self.request, tender, 'cancellations')
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def get(self):
+        """Retrieving the cancellation
+        """
+        return {'data': serialize_fields(self.request, self.request.validated['cancellation'])}
+
+    def cancel_lot(self, cancellation=None):
+        super(TenderNegotiationCancellationResource, self).cancel_lot(cancellation)
+        self.request.validated['tender'].invalidate_lot_index()
+
     def validate_cancellation(self, operation):
         """ TODO move validators
         This class is inherited from below package, but validate_cancellation function has different validators.
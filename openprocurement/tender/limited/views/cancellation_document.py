@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from openprocurement.tender.core.utils import optendersresource
+from openprocurement.tender.limited.timing import json_view
 from openprocurement.tender.belowthreshold.views.cancellation_document import TenderCancellationDocumentResource as BaseResource
+from openprocurement.tender.limited.utils import get_documents_collection, conditional_view
 
 
 @optendersresource(name='reporting:Tender Cancellation Documents',
@@ -11,6 +13,13 @@ from openprocurement.tender.belowthreshold.views.cancellation_document import Te
 class TenderCancellationDocumentResource(BaseResource):
     """ Tender Limited Cancellation Documents """
 
+    @json_view(permission='view_tender')
+    @conditional_view
+    def collection_get(self):
+        """Tender Cancellation Documents List"""
+        cancellation = self.request.validated['cancellation']
+        return get_documents_collection(self.request, 'cancellations/{}/documents'.format(cancellation.id), cancellation)
+
 
 @optendersresource(name='negotiation:Tender Cancellation Documents',
                    collection_path='/tenders/{tender_id}/cancellations/{cancellation_id}/documents',
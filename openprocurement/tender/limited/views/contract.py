@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    json_view, context_unpack, get_now, raise_operation_error
+    context_unpack, get_now, raise_operation_error, APIResource
 )
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 from openprocurement.tender.core.validation import (
     validate_contract_data,
     validate_patch_contract_data,
@@ -17,8 +18,11 @@ from openprocurement.tender.limited.validation import (
     validate_contract_update_in_cancelled,
     validate_contract_operation_not_in_active,
     validate_contract_items_count_modification,
-    validate_contract_with_cancellations_and_contract_signing
+    validate_contract_with_cancellations_and_contract_signing,
+    validate_contract_bulk_signing_data,
+    validate_contracts_bulk_signing
 )
+from openprocurement.tender.limited.utils import get_collection, serialize_fields, conditional_view, save_rebased
 
 def check_tender_status(request):
     tender = request.validated['tender']
@@ -30,10 +34,11 @@ def check_tender_negotiation_status(request):
     tender = request.validated['tender']
     now = get_now()
     if tender.lots:
+        lot_index = tender.get_lot_index()
         for lot in tender.lots:
             if lot.status != 'active':
                 continue
-            lot_awards = [i for i in tender.awards if i.lotID == lot.id]
+            lot_awards = lot_index.awards.get(lot.id, [])
             if not lot_awards:
                 continue
             last_award = lot_awards[-1]
@@ -51,7 +56,7 @@ def check_tender_negotiation_status(request):
             elif last_award.status == 'unsuccessful':
                 lot.status = 'unsuccessful'
                 continue
-            elif last_award.status == 'active' and any([i.status == 'active' and i.awardID == last_award.id for i in tender.contracts]):
+            elif last_award.status == 'active' and any([i.status == 'active' and i.awardID == last_award.id for i in lot_index.contracts.get(lot.id, [])]):
                 lot.status = 'complete'
         statuses = set([lot.status for lot in tender.lots])
         if statuses == set(['cancelled']):
@@ -65,12 +70,84 @@ def check_tender_negotiation_status(request):
             tender.status = 'complete'
 
 
+def check_lot_negotiation_status(tender, lot, now):
+    """ check_tender_negotiation_status for a single lot.
+
+    The status the lot may move to is found from its last award first, so
+    complaints and stand-still periods are only scanned for lots that can
+    change status.
+    """
+    lot_index = tender.get_lot_index()
+    lot_awards = lot_index.awards.get(lot.id, [])
+    if not lot_awards:
+        return
+    last_award = lot_awards[-1]
+    if last_award.status == 'unsuccessful':
+        status = 'unsuccessful'
+    elif last_award.status == 'active' and any([i.status == 'active' and i.awardID == last_award.id for i in lot_index.contracts.get(lot.id, [])]):
+        status = 'complete'
+    else:
+        return
+    pending_awards_complaints = lot_index.complaints(lot.id, ['claim', 'answered', 'pending'])
+    stand_still_end = max([
+        a.complaintPeriod.endDate or now
+        for a in lot_awards
+    ])
+    if pending_awards_complaints or not stand_still_end <= now:
+        return
+    lot_index.set_lot_status(lot, status)
+
+
+def update_tender_negotiation_status(request, contract):
+    """ Incremental version of check_tender_negotiation_status.
+
+    Only the lot of the patched ``contract`` is re-evaluated, tender status
+    is derived from lot status counters of the lot index. Other lots keep
+    their status until their own contract is patched, while the full check
+    re-evaluates every active lot on each patch.
+    """
+    tender = request.validated['tender']
+    if not tender.lots:
+        if tender.contracts and tender.contracts[-1].status == 'active':
+            tender.status = 'complete'
+        return
+    lot_index = tender.get_lot_index()
+    award = lot_index.awards_by_id.get(contract.awardID)
+    lot = lot_index.lots.get(award.lotID) if award else None
+    if lot is not None and lot.status == 'active':
+        check_lot_negotiation_status(tender, lot, get_now())
+    statuses = lot_index.lot_statuses
+    if statuses['cancelled'] == len(tender.lots):
+        tender.status = 'cancelled'
+    elif statuses['unsuccessful'] + statuses['cancelled'] == len(tender.lots):
+        tender.status = 'unsuccessful'
+    elif statuses['complete'] + statuses['unsuccessful'] + statuses['cancelled'] == len(tender.lots):
+        tender.status = 'complete'
+
+
 @optendersresource(name='reporting:Tender Contracts',
                    collection_path='/tenders/{tender_id}/contracts',
                    procurementMethodType='reporting',
                    path='/tenders/{tender_id}/contracts/{contract_id}',
                    description="Tender contracts")
 class TenderAwardContractResource(BaseTenderAwardContractResource):
+    rebase_validators = (validate_patch_contract_data, validate_contract_operation_not_in_active,
+                         validate_contract_update_in_cancelled, validate_update_contract_value,
+                         validate_contract_items_count_modification)
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def collection_get(self):
+        """List contracts for award
+        """
+        return get_collection(self.request, self.request.validated['tender'], 'contracts', role=None)
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def get(self):
+        """Retrieving the contract for award
+        """
+        return {'data': serialize_fields(self.request, self.request.validated['contract'], role=None)}
 
     @json_view(content_type="application/json", permission='create_contract', validators=(validate_contract_data, validate_contract_operation_not_in_active))
     def collection_post(self):
@@ -92,20 +169,25 @@ class TenderAwardContractResource(BaseTenderAwardContractResource):
     def patch(self):
         """Update of contract
         """
-        contract_status = self.request.context.status
-        apply_patch(self.request, save=False, src=self.request.context.serialize())
-        self.request.context.date = get_now()
-        if contract_status != self.request.context.status and contract_status != 'pending' and self.request.context.status != 'active':
-            raise_operation_error(self.request, 'Can\'t update contract status')
-
-        if self.request.context.status == 'active' and not self.request.context.dateSigned:
-            self.request.context.dateSigned = get_now()
-        check_tender_status(self.request)
-        if save_tender(self.request):
+        if save_rebased(self.request, 'contract', self.update_contract, self.rebase_validators):
             self.LOGGER.info('Updated tender contract {}'.format(self.request.context.id),
                              extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_contract_patch'}))
             return {'data': self.request.context.serialize()}
 
+    def update_contract(self, contract):
+        contract_status = contract.status
+        apply_patch(self.request, save=False, src=contract.serialize())
+        contract.date = get_now()
+        if contract_status != contract.status and contract_status != 'pending' and contract.status != 'active':
+            raise_operation_error(self.request, 'Can\'t update contract status')
+
+        if contract.status == 'active' and not contract.dateSigned:
+            contract.dateSigned = get_now()
+        self.update_tender_status(contract)
+
+    def update_tender_status(self, contract):
+        check_tender_status(self.request)
+
 
 @optendersresource(name='negotiation:Tender Contracts',
                    collection_path='/tenders/{tender_id}/contracts',
@@ -114,24 +196,19 @@ class TenderAwardContractResource(BaseTenderAwardContractResource):
                    description="Tender contracts")
 class TenderNegotiationAwardContractResource(TenderAwardContractResource):
     """ Tender Negotiation Award Contract Resource """
+    rebase_validators = (validate_patch_contract_data, validate_contract_operation_not_in_active,
+                         validate_contract_update_in_cancelled, validate_contract_with_cancellations_and_contract_signing,
+                         validate_update_contract_value, validate_contract_items_count_modification)
+
     @json_view(content_type="application/json", permission='edit_tender', validators=(validate_patch_contract_data, validate_contract_operation_not_in_active, validate_contract_update_in_cancelled,
                validate_contract_with_cancellations_and_contract_signing, validate_update_contract_value, validate_contract_items_count_modification))
     def patch(self):
         """Update of contract
         """
-        contract_status = self.request.context.status
-        apply_patch(self.request, save=False, src=self.request.context.serialize())
-        self.request.context.date = get_now()
-        if contract_status != self.request.context.status and contract_status != 'pending' and self.request.context.status != 'active':
-            raise_operation_error(self.request, 'Can\'t update contract status')
+        return super(TenderNegotiationAwardContractResource, self).patch()
 
-        if self.request.context.status == 'active' and not self.request.context.dateSigned:
-            self.request.context.dateSigned = get_now()
-        check_tender_negotiation_status(self.request)
-        if save_tender(self.request):
-            self.LOGGER.info('Updated tender contract {}'.format(self.request.context.id),
-                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_contract_patch'}))
-            return {'data': self.request.context.serialize()}
+    def update_tender_status(self, contract):
+        update_tender_negotiation_status(self.request, contract)
 
 
 @optendersresource(name='negotiation.quick:Tender Contracts',
@@ -141,3 +218,41 @@ class TenderNegotiationAwardContractResource(TenderAwardContractResource):
                    description="Tender contracts")
 class TenderNegotiationQuickAwardContractResource(TenderNegotiationAwardContractResource):
     """ Tender Negotiation Quick Award Contract Resource """
+
+
+@optendersresource(name='negotiation:Tender Contracts Bulk',
+                   path='/tenders/{tender_id}/bulk/contracts',
+                   description="Tender contracts bulk signing",
+                   procurementMethodType='negotiation')
+class TenderNegotiationAwardContractBulkResource(APIResource):
+    """ Tender Negotiation Award Contract Bulk Resource """
+
+    @json_view(content_type="application/json", permission='edit_tender', validators=(validate_contract_bulk_signing_data, validate_contract_operation_not_in_active, validate_contracts_bulk_signing))
+    def patch(self):
+        """Sign several contracts at once
+
+        Contracts are listed as ``{"id": ..., "status": "active"}`` with
+        optional ``dateSigned``. Stand-still periods and complaints are
+        checked for all of them, tender and lot statuses are recalculated
+        once and all contracts are signed in a single tender revision.
+        """
+        now = get_now()
+        contracts = []
+        for contract, date_signed in self.request.validated['contracts']:
+            contract.status = 'active'
+            contract.date = now
+            contract.dateSigned = date_signed or now
+            contracts.append(contract)
+        check_tender_negotiation_status(self.request)
+        if save_tender(self.request):
+            self.LOGGER.info('Signed tender contracts {}'.format(', '.join([i.id for i in contracts])),
+                             extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_contract_bulk_patch'}))
+            return {'data': [i.serialize() for i in contracts]}
+
+
+@optendersresource(name='negotiation.quick:Tender Contracts Bulk',
+                   path='/tenders/{tender_id}/bulk/contracts',
+                   description="Tender contracts bulk signing",
+                   procurementMethodType='negotiation.quick')
+class TenderNegotiationQuickAwardContractBulkResource(TenderNegotiationAwardContractBulkResource):
+    """ Tender Negotiation Quick Award Contract Bulk Resource """
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    upload_file, update_file_content_type, json_view, context_unpack
+    upload_file, update_file_content_type, context_unpack
 )
 from openprocurement.tender.core.utils import (
-    apply_patch, save_tender, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 
 from openprocurement.api.validation import (
     validate_file_update, validate_file_upload, validate_patch_document_data
@@ -16,6 +17,7 @@ from openprocurement.tender.limited.validation import (
     validate_document_operation_not_in_active,
     validate_contract_document_operation_not_in_allowed_contract_status
 )
+from openprocurement.tender.limited.utils import get_documents_collection, conditional_view
 
 
 @optendersresource(name='reporting:Tender Contract Documents',
@@ -26,17 +28,11 @@ from openprocurement.tender.limited.validation import (
 class TenderAwardContractDocumentResource(BaseTenderAwardContractDocumentResource):
 
     @json_view(permission='view_tender')
+    @conditional_view
     def collection_get(self):
         """Tender Contract Documents List"""
         contract = self.request.validated['contract']
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in contract['documents']]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in contract['documents']
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        return get_documents_collection(self.request, 'contracts/{}/documents'.format(contract.id), contract)
 
     @json_view(permission='edit_tender', validators=(validate_file_upload, validate_document_operation_not_in_active, validate_contract_document_operation_not_in_allowed_contract_status))
     def collection_post(self):
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    json_view, context_unpack, get_now, raise_operation_error
+    context_unpack, get_now, raise_operation_error
 )
 from openprocurement.tender.core.utils import (
-    save_tender, apply_patch, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 from openprocurement.tender.core.validation import (
     validate_lot_data, validate_patch_lot_data,
 )
@@ -15,6 +16,7 @@ from openprocurement.tender.limited.validation import (
     validate_lot_operation_with_awards,
     validate_lot_operation_not_in_active_status
 )
+from openprocurement.tender.limited.utils import get_collection, serialize_fields, conditional_view
 
 @optendersresource(name='negotiation.quick:Tender Lots',
                    collection_path='/tenders/{tender_id}/lots',
@@ -24,6 +26,20 @@ from openprocurement.tender.limited.validation import (
 class TenderLimitedNegotiationQuickLotResource(TenderLotResource):
     route_name = 'Tender limited negotiation quick Lots'
 
+    @json_view(permission='view_tender')
+    @conditional_view
+    def collection_get(self):
+        """Lots Listing
+        """
+        return get_collection(self.request, self.request.validated['tender'], 'lots')
+
+    @json_view(permission='view_tender')
+    @conditional_view
+    def get(self):
+        """Retrieving the lot
+        """
+        return {'data': serialize_fields(self.request, self.request.validated['lot'])}
+
     @json_view(content_type="application/json", validators=(validate_lot_data, validate_lot_operation_not_in_active_status, validate_lot_operation_with_awards), permission='edit_tender')
     def collection_post(self):
         """Add a lot
@@ -47,9 +63,10 @@ class TenderLimitedNegotiationQuickLotResource(TenderLotResource):
         """
         tender = self.request.validated['tender']
         lot = self.request.context
-        if [cancellation for cancellation in tender.get('cancellations') if cancellation.get('relatedLot') == lot['id']]:
+        if tender.get_lot_index().cancellations.get(lot.id):
             raise_operation_error(self.request, 'Can\'t update lot when it has \'pending\' cancellation.')
         if apply_patch(self.request, src=self.request.context.serialize()):
+            tender.invalidate_lot_index()
             self.LOGGER.info('Updated tender lot {}'.format(self.request.context.id),
                              extra=context_unpack(self.request, {'MESSAGE_ID': 'tender_lot_patch'}))
             return {'data': self.request.context.serialize("view")}
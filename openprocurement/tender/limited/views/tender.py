@@ -4,12 +4,13 @@ from openprocurement.tender.core.validation import (
     validate_tender_status_update_in_terminated_status
 )
 from openprocurement.api.utils import (
-    json_view, context_unpack
+    context_unpack
 )
 
 from openprocurement.tender.core.utils import (
-    apply_patch, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch
 
 from openprocurement.tender.belowthreshold.views.tender import (
     TenderResource as BaseTenderResource
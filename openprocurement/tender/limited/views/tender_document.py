@@ -1,18 +1,22 @@
 # -*- coding: utf-8 -*-
 from openprocurement.api.utils import (
-    get_file, upload_file, update_file_content_type, json_view, context_unpack,
+    get_file, upload_file, update_file_content_type, context_unpack,
     APIResource
 )
 
 from openprocurement.tender.core.utils import (
-    save_tender, apply_patch, optendersresource
+    optendersresource
 )
+from openprocurement.tender.limited.timing import json_view, apply_patch, save_tender
 
 from openprocurement.api.validation import (
     validate_file_update, validate_file_upload, validate_patch_document_data
 )
 
 from openprocurement.tender.limited.validation import validate_operation_with_document_not_in_active_status
+from openprocurement.tender.limited.utils import (
+    get_documents_collection, get_previous_versions, conditional_view
+)
 
 @optendersresource(name='reporting:Tender Documents',
                    collection_path='/tenders/{tender_id}/documents',
@@ -22,17 +26,11 @@ from openprocurement.tender.limited.validation import validate_operation_with_do
 class TenderDocumentResource(APIResource):
 
     @json_view(permission='view_tender')
+    @conditional_view
     def collection_get(self):
         """Tender Documents List"""
         tender = self.request.validated['tender']
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in tender['documents']]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in tender['documents']
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        return get_documents_collection(self.request, 'documents', tender)
 
     @json_view(permission='upload_tender_documents', validators=(validate_file_upload, validate_operation_with_document_not_in_active_status))
     def collection_post(self):
@@ -48,17 +46,14 @@ class TenderDocumentResource(APIResource):
             return {'data': document.serialize("view")}
 
     @json_view(permission='view_tender')
+    @conditional_view
     def get(self):
         """Tender Document Read"""
         if self.request.params.get('download'):
             return get_file(self.request)
         document = self.request.validated['document']
         document_data = document.serialize("view")
-        document_data['previousVersions'] = [
-            i.serialize("view")
-            for i in self.request.validated['documents']
-            if i.url != document.url
-        ]
+        document_data['previousVersions'] = get_previous_versions(self.request.validated['tender'], document)
         return {'data': document_data}
 
     @json_view(permission='upload_tender_documents', validators=(validate_file_update, validate_operation_with_document_not_in_active_status))
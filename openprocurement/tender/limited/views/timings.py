@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from cornice.service import Service
+from pyramid.security import Allow, ALL_PERMISSIONS
+
+from openprocurement.tender.limited.timing import timings
+
+
+class TimingsRoot(object):
+    __name__ = None
+    __parent__ = None
+    __acl__ = [
+        (Allow, 'g:Administrator', 'view_timings'),
+        (Allow, 'g:admins', ALL_PERMISSIONS),
+    ]
+
+    def __init__(self, request):
+        self.request = request
+
+
+timings_service = Service(name='Limited Timings', path='/limited/timings', factory=TimingsRoot,
+                          renderer='json', description="Timing histograms of limited procedures")
+
+
+@timings_service.get(permission='view_timings')
+def get_timings(request):
+    """ Histograms of timed calls, see openprocurement.tender.limited.timing """
+    return {'data': timings.dump()}